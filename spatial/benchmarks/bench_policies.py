@@ -0,0 +1,277 @@
+"""
+Per-step latency and scaling benchmarks for everything in spatial/src.
+
+Sweeps the number of arms K, the horizon T and the arm dimension d one axis
+at a time (the others held at their defaults), measures wall time per
+select_arm/update call and peak traced memory, and writes the results as
+JSON. With --baseline, every case is compared against a previous result file
+and slowdowns beyond --threshold are reported (exit code 1).
+
+    python bench_policies.py --quick --out results.json
+    python bench_policies.py --baseline baseline.json --out results.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from src import (
+    generate_ground_truth,
+    RegretTracker,
+    BernoulliUCB, BernoulliKLUCB, BernoulliTS,
+    GaussianUCB, GaussianUCB0, GaussianUCB1, GaussianTS,
+    GaussianProcessUCB, GaussianProcessTS,
+    get_zoomin_algorithm,
+    select_index, update_policy,
+)
+
+SIGMA = 0.1
+
+FULL_GRID = {"K": [10, 100, 1_000, 10_000, 100_000], "T": [100, 1_000, 10_000, 100_000], "d": [1, 2, 5, 10]}
+FULL_DEFAULTS = {"K": 100, "T": 1_000, "d": 2}
+QUICK_GRID = {"K": [10, 100, 500], "T": [100, 300, 1_000], "d": [1, 2, 5]}
+QUICK_DEFAULTS = {"K": 100, "T": 300, "d": 2}
+
+# name -> (constructor(f, X, K, d), limits). Cases beyond the limits are
+# recorded as skipped: GP policies refit on all past data every step and
+# Zoom-In evaluates f on every candidate arm when it activates a region.
+POLICIES = {
+    "BernoulliUCB": (lambda f, X, K, d: BernoulliUCB(K), {"KT": 2e7}),
+    "BernoulliKLUCB": (lambda f, X, K, d: BernoulliKLUCB(K), {"KT": 1e8}),
+    "BernoulliTS": (lambda f, X, K, d: BernoulliTS(K), {"KT": 1e8}),
+    "GaussianUCB": (lambda f, X, K, d: GaussianUCB(K), {"KT": 2e7}),
+    "GaussianUCB0": (lambda f, X, K, d: GaussianUCB0(K), {"KT": 1e8}),
+    "GaussianUCB1": (lambda f, X, K, d: GaussianUCB1(K), {"KT": 2e7}),
+    "GaussianTS": (lambda f, X, K, d: GaussianTS(K), {"KT": 1e8}),
+    "GP-UCB": (lambda f, X, K, d: GaussianProcessUCB(X, length_scale=1.0, noise=SIGMA), {"K": 10_000, "T": 300}),
+    "GP-TS": (lambda f, X, K, d: GaussianProcessTS(X, length_scale=1.0, noise=SIGMA), {"K": 1_000, "T": 300}),
+    "Zooming": (lambda f, X, K, d: get_zoomin_algorithm(f, X, domain=[[0, 1]] * d, rounds=None, nu=1.0, rho=0.9,
+                                                        min_pulls_before_zoom=1), {"K": 10_000, "T": 10_000}),
+}
+GROUND_TRUTH_LIMITS = {"K": 5_000}
+
+def within(limits, K=None, T=None):
+    if "K" in limits and K is not None and K > limits["K"]:
+        return False
+    if "T" in limits and T is not None and T > limits["T"]:
+        return False
+    if "KT" in limits and K is not None and T is not None and K * T > limits["KT"]:
+        return False
+    return True
+
+def traced(fn):
+    """Run fn once untimed under tracemalloc and return (result, peak bytes)."""
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+def run_policy(make, mu, X, f, K, d, T, seed):
+    np.random.seed(seed)
+    algo = make(f, X, K, d)
+    tracker = RegretTracker(mu, X)
+    select_s = update_s = track_s = 0.0
+    for t in range(T):
+        t0 = time.perf_counter()
+        a_t = select_index(algo, t)
+        t1 = time.perf_counter()
+        reward = np.random.normal(mu[a_t], SIGMA)
+        t2 = time.perf_counter()
+        update_policy(algo, a_t, reward, t)
+        t3 = time.perf_counter()
+        tracker.update(a_t)
+        t4 = time.perf_counter()
+        select_s += t1 - t0
+        update_s += t3 - t2
+        track_s += t4 - t3
+    return select_s, update_s, track_s
+
+def bench_policy(name, K, T, d, seed, memory):
+    make, limits = POLICIES[name]
+    case = {"kind": "policy", "name": name, "K": K, "T": T, "d": d}
+    if not within(limits, K, T):
+        return {**case, "skipped": True}
+    X, mu, f = ground_truth(K, d, seed)
+    start = time.perf_counter()
+    select_s, update_s, track_s = run_policy(make, mu, X, f, K, d, T, seed)
+    total = time.perf_counter() - start
+    res = {**case, "skipped": False, "total_s": total,
+           "select_us": 1e6 * select_s / T, "update_us": 1e6 * update_s / T,
+           "tracker_us": 1e6 * track_s / T, "steps_per_s": T / total}
+    if memory:
+        _, peak = traced(lambda: run_policy(make, mu, X, f, K, d, T, seed))
+        res["peak_mb"] = peak / 2**20
+    return res
+
+_GT_CACHE = {}
+
+def ground_truth(K, d, seed):
+    # the policy benchmarks need a scenario but must not pay for it; past the
+    # exact generator's limit fall back to a random surface of the same shape
+    key = (K, d, seed)
+    if key not in _GT_CACHE:
+        if within(GROUND_TRUTH_LIMITS, K=K):
+            X, mu, f = generate_ground_truth(K=K, d=d, reward_noise_std=SIGMA, random_state=seed, length_scale=1.0)
+        else:
+            rng = np.random.default_rng(seed)
+            X, mu = rng.uniform(0, 1, size=(K, d)), rng.uniform(0, 1, size=K)
+            f = lambda x: float(mu[np.argmin(np.linalg.norm(X - np.atleast_2d(x), axis=1))])
+        _GT_CACHE.clear()
+        _GT_CACHE[key] = (X, mu, f)
+    return _GT_CACHE[key]
+
+def bench_ground_truth(K, d, seed, memory):
+    case = {"kind": "ground_truth", "name": "generate_ground_truth", "K": K, "T": None, "d": d}
+    if not within(GROUND_TRUTH_LIMITS, K=K):
+        return {**case, "skipped": True}
+    make = lambda: generate_ground_truth(K=K, d=d, reward_noise_std=SIGMA, random_state=seed, length_scale=1.0)
+    start = time.perf_counter()
+    _, _, f = make()
+    total = time.perf_counter() - start
+    x = np.full(d, 0.5)
+    start = time.perf_counter()
+    for _ in range(100):
+        f(x)
+    res = {**case, "skipped": False, "total_s": total, "f_call_us": 1e6 * (time.perf_counter() - start) / 100}
+    if memory:
+        _, peak = traced(make)
+        res["peak_mb"] = peak / 2**20
+    return res
+
+def bench_tracker(K, T, seed, memory):
+    case = {"kind": "tracker", "name": "RegretTracker", "K": K, "T": T, "d": 2}
+    rng = np.random.default_rng(seed)
+    mu, X, arms = rng.uniform(size=K), rng.uniform(size=(K, 2)), rng.integers(0, K, size=T)
+
+    def run():
+        tracker = RegretTracker(mu, X)
+        for a in arms:
+            tracker.update(a)
+        return tracker.get_instantaneous_regrets()
+
+    start = time.perf_counter()
+    run()
+    total = time.perf_counter() - start
+    res = {**case, "skipped": False, "total_s": total, "update_us": 1e6 * total / T}
+    if memory:
+        _, peak = traced(run)
+        res["peak_mb"] = peak / 2**20
+    return res
+
+def sweep(grid, defaults, policies, seed, memory, log):
+    # one axis at a time; in the K and d sweeps, policies with a horizon limit
+    # run at that limit instead of being skipped
+    cases = [("K", K, defaults["T"], defaults["d"]) for K in grid["K"]]
+    cases += [("T", defaults["K"], T, defaults["d"]) for T in grid["T"]]
+    cases += [("d", defaults["K"], defaults["T"], d) for d in grid["d"]]
+
+    results = []
+    seen = set()
+    for axis, K, T, d in cases:
+        for name in policies:
+            T_run = T if axis == "T" else min(T, POLICIES[name][1].get("T", T))
+            if (name, K, T_run, d) in seen:
+                continue
+            seen.add((name, K, T_run, d))
+            results.append(bench_policy(name, K, T_run, d, seed, memory))
+            log(results[-1])
+    for K, d in dict.fromkeys((K, d) for _, K, _, d in cases):
+        results.append(bench_ground_truth(K, d, seed, memory))
+        log(results[-1])
+    for K, T in dict.fromkeys((K, T) for _, K, T, _ in cases):
+        results.append(bench_tracker(K, T, seed, memory))
+        log(results[-1])
+    return results
+
+def case_key(res):
+    return (res["kind"], res["name"], res["K"], res["T"], res["d"])
+
+def compare(results, baseline, threshold, min_seconds=0.01):
+    """
+    Returns
+    -------
+    list of dict
+        Cases whose time or peak memory grew by more than `threshold`x.
+        Cases that took less than `min_seconds` in the baseline are too noisy
+        to compare on time.
+    """
+    base = {case_key(r): r for r in baseline["results"] if not r.get("skipped")}
+    regressions = []
+    for res in results:
+        old = base.get(case_key(res))
+        if old is None or res.get("skipped"):
+            continue
+        for metric in ("total_s", "peak_mb"):
+            if metric == "total_s" and old.get(metric, 0) < min_seconds:
+                continue
+            if metric in res and metric in old and old[metric] > 0:
+                ratio = res[metric] / old[metric]
+                if ratio > threshold:
+                    regressions.append({"case": case_key(res), "metric": metric,
+                                        "baseline": old[metric], "current": res[metric], "ratio": ratio})
+    return regressions
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="small grid for a smoke run")
+    parser.add_argument("--policies", nargs="+", default=list(POLICIES), choices=list(POLICIES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced peak-memory pass")
+    parser.add_argument("--out", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="result file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="flag cases slower/larger by this factor")
+    args = parser.parse_args(argv)
+
+    def log(res):
+        if res.get("skipped"):
+            print(f"{res['name']:>22} K={res['K']:<7} T={res['T']!s:<7} d={res['d']:<3} skipped")
+        else:
+            print(f"{res['name']:>22} K={res['K']:<7} T={res['T']!s:<7} d={res['d']:<3} {res['total_s']:9.3f}s"
+                  + (f" {res['peak_mb']:9.1f}MB" if "peak_mb" in res else ""))
+
+    grid, defaults = (QUICK_GRID, QUICK_DEFAULTS) if args.quick else (FULL_GRID, FULL_DEFAULTS)
+    results = sweep(grid, defaults, args.policies, args.seed, not args.no_memory, log)
+    report = {"meta": {**environment(), "grid": grid, "defaults": defaults, "seed": args.seed}, "results": results}
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as fh:
+            regressions = compare(results, json.load(fh), args.threshold)
+        report["regressions"] = regressions
+        for reg in regressions:
+            print(f"REGRESSION {reg['case']} {reg['metric']}: {reg['baseline']:.4g} -> {reg['current']:.4g} "
+                  f"({reg['ratio']:.2f}x)")
+        status = 1 if regressions else 0
+
+    with open(args.out, "w") as fh:
+        json.dump(report, fh, indent=2)
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
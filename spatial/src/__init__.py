@@ -1,40 +1,106 @@
 # src/__init__.py
 
-# Simulation setup
-from .simulation_setup import generate_ground_truth, generate_multiple_ground_truths
-
-# Regret tracking
-from .regret import RegretTracker
-
-# Standard bandits
-from .standard_bandits import (
-    BernoulliUCB,
-    BernoulliTS,
-    GaussianUCB,
-    GaussianTS,
-    GaussianUCB0,
-    GaussianUCB1
-)
-
-# GP bandits
-from .gp_bandits import (
-    GaussianProcessUCB,
-    GaussianProcessTS
-)
-
-# Zoom-In
-from .zoomin_bandit import get_zoomin_algorithm
-
-# Plotting
-from .utils import (
-    plot_rewards,
-    plot_cumulative_regret,
-    plot_cumulative_regret_logit,
-    plot_instantaneous_regret,
-    ensure_scalar, 
-    plot_arm_positions,
-    plot_instantaneous_regret_s,
-    plot_cumulative_regret_s,
-    plot_distance_to_best_arm,
-    plot_distance_to_best_arm_s
-)
\ No newline at end of file
+# Submodules are imported on first attribute access (PEP 562), so that e.g.
+# `from src import BernoulliTS` does not pull in sklearn, PyXAB or the plotting
+# stack. Each public name maps to the submodule that defines it.
+
+import importlib
+
+_EXPORTS = {
+    # Simulation setup
+    ".simulation_setup": ["generate_ground_truth", "generate_multiple_ground_truths", "generate_rff_ground_truth"],
+
+    # Regret tracking
+    ".regret": ["RegretTracker"],
+
+    # Standard bandits
+    ".standard_bandits": [
+        "BernoulliUCB",
+        "BernoulliKLUCB",
+        "BernoulliTS",
+        "GaussianUCB",
+        "GaussianTS",
+        "GaussianUCB0",
+        "GaussianUCB1",
+    ],
+
+    # GP bandits
+    ".gp_bandits": ["GaussianProcessUCB", "GaussianProcessTS"],
+
+    # Batched GP backend (torch)
+    ".gp_batched": ["BatchedGaussianProcessBandit", "run_batched_gp"],
+
+    # Driving any policy by arm index
+    ".adapters": ["select_index", "select_indices", "update_policy", "PolicySpec"],
+
+    # Running comparisons
+    ".runner": [
+        "run_policy",
+        "run_comparison",
+        "ComparisonResult",
+        "CommonNoise",
+        "run_adaptive_comparison",
+        "ConvergenceRule",
+    ],
+
+    # Trajectory storage
+    ".trajectories": ["TrajectoryWriter", "TrajectoryStore"],
+
+    # Fused whole-horizon simulation
+    ".simulation_kernels": ["simulate"],
+
+    # Result cache
+    ".cache": ["ResultCache"],
+
+    # Hyperparameter sweeps
+    ".sweep": ["run_sweep", "summarize_sweep"],
+
+    # Instrumentation
+    ".profiling": ["PolicyProfile", "instrument", "uninstrument", "aggregate_profiles"],
+
+    # Offline evaluation
+    ".replay": ["ReplayEvaluator", "ReplayResult", "iter_log_chunks"],
+
+    # Serving
+    ".serving": ["PolicyServer", "run_load_test"],
+
+    # Checkpoints
+    ".checkpoint": ["save_checkpoint", "load_checkpoint"],
+
+    # Zoom-In
+    ".zoomin_bandit": ["get_zoomin_algorithm"],
+
+    # Figure reports
+    ".report": ["render_report", "aggregate_curves", "downsample"],
+
+    # Plotting
+    ".utils": [
+        "plot_rewards",
+        "plot_cumulative_regret",
+        "plot_cumulative_regret_logit",
+        "plot_instantaneous_regret",
+        "ensure_scalar",
+        "plot_arm_positions",
+        "plot_instantaneous_regret_s",
+        "plot_cumulative_regret_s",
+        "plot_distance_to_best_arm",
+        "plot_distance_to_best_arm_s",
+    ],
+}
+
+_MODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULE_OF)
+
+
+def __getattr__(name):
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,156 @@
+import inspect
+import numpy as np
+
+# The policies in this package do not share one calling convention:
+# GaussianUCB0/1 keep their own clock and take no `t` in select_arm, the rest
+# take `t`, and the Zoom-In wrapper returns coordinates instead of an index.
+# These helpers drive any of them by arm index.
+
+_SELECT_TAKES_TIME = {}
+
+def select_index(algo, t: int) -> int:
+    """
+    Ask a policy for its next arm.
+
+    Parameters
+    ----------
+    algo : object
+        Any policy from this package
+    t : int
+        Current (0-based) timestep of this policy
+
+    Returns
+    -------
+    int
+        Index of the selected arm
+    """
+    if hasattr(algo, "get_selected_index"):
+        algo.select_arm(t)
+        return int(algo.get_selected_index())
+    takes_time = _SELECT_TAKES_TIME.get(type(algo))
+    if takes_time is None:
+        # inspect the class, not the instance, whose select_arm may be wrapped
+        # (see profiling.instrument)
+        takes_time = len(inspect.signature(type(algo).select_arm).parameters) > 1
+        _SELECT_TAKES_TIME[type(algo)] = takes_time
+    return int(algo.select_arm(t) if takes_time else algo.select_arm())
+
+def update_policy(algo, arm: int, reward: float, t: int) -> None:
+    """
+    Feed the reward of the arm chosen by `select_index` back to a policy.
+
+    Parameters
+    ----------
+    algo : object
+        Any policy from this package
+    arm : int
+        Index of the arm that was pulled
+    reward : float
+        Observed reward
+    t : int
+        Timestep at which the arm was pulled
+    """
+    if hasattr(algo, "update"):
+        algo.update(arm, reward)
+    else:
+        algo.receive_reward(t, reward)
+
+# Policies whose selection is randomised given their state: asking them
+# several times without an update yields distinct draws from the posterior.
+# Every other policy is deterministic given its state (or needs the updates of
+# a round-robin warm-up), so repeated selections would only repeat one arm.
+_RANDOMIZED_POLICIES = ("BernoulliTS", "GaussianTS", "GaussianProcessTS")
+
+def _batch_safe(algo) -> bool:
+    name = type(algo).__name__
+    if name == "DiscreteZoomingWrapper":
+        return algo.scoring_method == "ts"
+    return name in _RANDOMIZED_POLICIES
+
+def select_indices(algo, n: int, t: int) -> list:
+    """
+    Ask a policy for up to `n` arms without feeding back any reward, i.e. as
+    if several requests arrived before the next update.
+
+    Only policies with randomised selection (Thompson sampling) return `n`
+    arms: they are all drawn from the current posterior at the same `t`, in
+    one call if the policy exposes a batched `select_arms(n, t)`. For all
+    other policies the state cannot justify more than one selection, so a
+    single arm is returned, except that arms the policy has never pulled are
+    all returned first: this is the policy's own warm-up, which would
+    otherwise be keyed on `t` and break once several pulls are in flight.
+
+    Parameters
+    ----------
+    algo : object
+        Any policy from this package
+    n : int
+        Maximum number of selections
+    t : int
+        Current timestep of the policy
+
+    Returns
+    -------
+    list of int
+        Indices of the selected arms
+    """
+    if not _batch_safe(algo):
+        counts = getattr(algo, "counts", None)
+        if counts is not None and not np.all(counts):
+            return [int(a) for a in np.flatnonzero(counts == 0)]
+        return [select_index(algo, t)]
+    if hasattr(algo, "select_arms"):
+        return [int(a) for a in algo.select_arms(n, t)]
+    return [select_index(algo, t) for _ in range(n)]
+
+_STANDARD_POLICIES = ("BernoulliUCB", "BernoulliKLUCB", "BernoulliTS", "GaussianUCB",
+                      "GaussianUCB0", "GaussianUCB1", "GaussianTS")
+_GP_POLICIES = ("GaussianProcessUCB", "GaussianProcessTS")
+_ZOOMING_POLICIES = ("Zooming", "DiscreteZoomingWrapper")
+
+class PolicySpec:
+    def __init__(self, policy, **params) -> None:
+        """
+        Picklable, hashable description of a policy and its settings, usable
+        wherever a constructor `(f, arms) -> policy` is expected.
+
+        Parameters
+        ----------
+        policy : str or type
+            Policy class (or its name) from this package; "Zooming" builds the
+            discrete Zoom-In wrapper via `get_zoomin_algorithm`
+        **params
+            Keyword arguments for the policy. The number of arms, the arm
+            positions and the reward function are filled in on construction;
+            Zoom-In defaults to the unit cube as domain.
+        """
+        self.policy = policy if isinstance(policy, str) else policy.__name__
+        if self.policy not in _STANDARD_POLICIES + _GP_POLICIES + _ZOOMING_POLICIES:
+            raise ValueError(f"Unknown policy: {self.policy}")
+        self.params = params
+
+    def __call__(self, f, arms):
+        arms = np.asarray(arms)
+        if self.policy in _STANDARD_POLICIES:
+            from . import standard_bandits
+            return getattr(standard_bandits, self.policy)(len(arms), **self.params)
+        if self.policy in _GP_POLICIES:
+            from . import gp_bandits
+            return getattr(gp_bandits, self.policy)(arms, **self.params)
+        from .zoomin_bandit import get_zoomin_algorithm
+        params = dict(self.params)
+        domain = params.pop("domain", [[0, 1]] * arms.shape[1])
+        return get_zoomin_algorithm(f, arms, domain=domain, rounds=None, **params)
+
+    def key(self) -> tuple:
+        return (self.policy, tuple(sorted((k, repr(v)) for k, v in self.params.items())))
+
+    def __eq__(self, other):
+        return isinstance(other, PolicySpec) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        args = ", ".join(f"{k}={v!r}" for k, v in sorted(self.params.items()))
+        return f"PolicySpec({self.policy!r}{', ' if args else ''}{args})"
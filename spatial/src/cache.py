@@ -0,0 +1,125 @@
+import hashlib
+import importlib
+import json
+import os
+import numpy as np
+
+from .adapters import PolicySpec, _STANDARD_POLICIES, _GP_POLICIES
+
+# Every (algorithm, run) trajectory is stored as one .npz file named by a hash
+# of everything that determines it: ground-truth parameters, seeds, policy
+# class and parameters, horizon, noise settings, and the source code of the
+# policy module and of the simulation code. Editing a policy therefore only
+# invalidates that policy's entries.
+
+_SIMULATION_MODULES = (".runner", ".regret", ".adapters", ".simulation_setup")
+
+_source_hashes = {}
+
+def _module_hash(name) -> str:
+    digest = _source_hashes.get(name)
+    if digest is None:
+        module = importlib.import_module(name, __package__)
+        with open(module.__file__, "rb") as fh:
+            digest = hashlib.sha256(fh.read()).hexdigest()
+        _source_hashes[name] = digest
+    return digest
+
+def _policy_modules(spec) -> tuple:
+    if spec.policy in _STANDARD_POLICIES:
+        return (".standard_bandits",)
+    if spec.policy in _GP_POLICIES:
+        return (".gp_bandits",)
+    return (".zooming", ".zoomin_bandit")
+
+def source_version(spec) -> str:
+    """
+    Hash of the source of the policy's module and of the simulation code.
+    """
+    modules = _policy_modules(spec) + _SIMULATION_MODULES
+    return hashlib.sha256("".join(_module_hash(m) for m in modules).encode()).hexdigest()
+
+class ResultCache:
+    def __init__(self, path) -> None:
+        """
+        On-disk cache of per-run trajectories for `run_comparison` and
+        `run_adaptive_comparison`.
+
+        Parameters
+        ----------
+        path : str
+            Cache directory (created if missing)
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(path, exist_ok=True)
+
+    def key(self, spec, ground_truth_kwargs, run, seed, T, sigma, **settings) -> str:
+        """
+        Parameters
+        ----------
+        spec : PolicySpec
+            Policy and its parameters
+        ground_truth_kwargs : dict
+            Arguments of `generate_ground_truth` (without `random_state`)
+        run : int
+            Run index, used as the ground truth's `random_state`
+        seed : list of int
+            Seed of the global NumPy generator for this trajectory
+        T : int
+            Horizon
+        sigma : float
+            Standard deviation of the reward noise
+        **settings
+            Any further option that changes the trajectory
+
+        Returns
+        -------
+        str
+            Hex digest identifying the trajectory
+        """
+        if not isinstance(spec, PolicySpec):
+            raise TypeError("Only PolicySpec constructors can be cached")
+        payload = {
+            "ground_truth": {**ground_truth_kwargs, "random_state": run},
+            "seed": list(seed),
+            "policy": spec.key(),
+            "T": T,
+            "sigma": sigma,
+            "settings": settings,
+            "source": source_version(spec),
+        }
+        blob = json.dumps(payload, sort_keys=True, default=repr)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def _file(self, key) -> str:
+        return os.path.join(self.path, key[:2], f"{key}.npz")
+
+    def get(self, key):
+        """
+        Returns
+        -------
+        dict or None
+            The stored trajectory, or None if missing or unreadable
+        """
+        try:
+            with np.load(self._file(key)) as data:
+                traj = {k: data[k] for k in ("arm", "regret", "distance")}
+                converged_at = int(data["converged_at"])
+        except (OSError, KeyError, ValueError):
+            self.misses += 1
+            return None
+        traj["converged_at"] = None if converged_at < 0 else converged_at
+        self.hits += 1
+        return traj
+
+    def put(self, key, traj) -> None:
+        file = self._file(key)
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+        converged_at = traj.get("converged_at")
+        tmp = f"{file}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as fh:
+            np.savez(fh, arm=traj["arm"], regret=traj["regret"], distance=traj["distance"],
+                     converged_at=-1 if converged_at is None else converged_at)
+        os.replace(tmp, file)
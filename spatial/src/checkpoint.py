@@ -0,0 +1,251 @@
+import importlib
+import json
+import os
+import numpy as np
+
+# A checkpoint is a directory holding `meta.json` (format version, policy class
+# and scalar settings) plus one uncompressed `.npy` file per array, so every
+# array can be memory-mapped on load. Pickle is never used.
+
+# version 2 added the archive of pruned Zoom-In arms
+FORMAT_VERSION = 2
+
+# policy class -> (scalar attributes, array attributes)
+_FLAT_STATE = {
+    "BernoulliUCB": (["K"], ["counts", "successes", "squared_sums"]),
+    "BernoulliKLUCB": (["K", "c", "tol", "max_iter"], ["counts", "successes"]),
+    "BernoulliTS": (["K"], ["successes", "failures"]),
+    "GaussianUCB": (["K"], ["counts", "means", "squared_sums"]),
+    "GaussianUCB0": (["K", "t"], ["counts", "values"]),
+    "GaussianUCB1": (["K", "t"], ["counts", "means", "squared_sums"]),
+    "GaussianTS": (["K", "obs_var"], ["prior_means", "prior_vars", "counts", "sum_rewards"]),
+}
+
+_GP_PARAMS = {
+    "GaussianProcessUCB": ["beta", "noise", "use_log_beta", "delta", "D", "optimizer"],
+    "GaussianProcessTS": ["noise", "optimizer"],
+}
+
+def _py(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+def _flat_state(algo, name):
+    scalars, arrays = _FLAT_STATE[name]
+    return ({k: _py(getattr(algo, k)) for k in scalars},
+            {k: np.asarray(getattr(algo, k)) for k in arrays})
+
+def _gp_state(algo, name):
+    meta = {k: _py(getattr(algo, k)) for k in _GP_PARAMS[name]}
+    meta["length_scale"] = float(algo.kernel.length_scale)
+    d = algo.arms.shape[1]
+    arrays = {
+        "arms": algo.arms,
+        "X": np.asarray(algo.X, dtype=float).reshape(-1, d),
+        "y": np.asarray(algo.y, dtype=float),
+    }
+    return meta, arrays
+
+def _zooming_state(wrapper):
+    zoom = wrapper.zoom
+    partition = zoom.partition
+    nodes = [node for layer in partition.get_node_list() for node in layer]
+    rows = {id(node): i for i, node in enumerate(nodes)}
+    keys = list(zoom.active_points)
+    bernoulli = zoom.reward_type == "bernoulli"
+    meta = {
+        "nu": _py(wrapper.nu),
+        "rho": _py(wrapper.rho),
+        "domain": wrapper.domain,
+        "scoring_method": wrapper.scoring_method,
+        "reward_type": wrapper.reward_type,
+        "min_pulls_before_zoom": wrapper.min_pulls_before_zoom,
+        "partition_class": f"{type(partition).__module__}.{type(partition).__name__}",
+        "partition_depth": partition.get_depth(),
+        "iteration": zoom.iteration,
+        "phase": zoom.phase,
+        "next_end_time": zoom.next_end_time,
+        "time": zoom.time,
+        "locked_in_step": getattr(zoom, "locked_in_step", None),
+        "best_arm": None if zoom.best_arm is None else list(zoom.best_arm.p),
+        "last_selected_index": _py(getattr(wrapper, "last_selected_index", None)),
+        "prune": zoom.prune,
+        "prune_every": zoom.prune_every,
+        "prune_sigma": zoom.prune_sigma,
+        "n_pruned": zoom.n_pruned,
+        "n_restored": zoom.n_restored,
+    }
+    arrays = {
+        "arms": np.asarray(wrapper.arms),
+        "node_depth": np.array([n.get_depth() for n in nodes], dtype=np.int64),
+        "node_index": np.array([n.get_index() for n in nodes], dtype=np.int64),
+        "node_parent": np.array([-1 if n.get_parent() is None else rows[id(n.get_parent())] for n in nodes], dtype=np.int64),
+        "node_domain": np.array([n.get_domain() for n in nodes], dtype=float),
+        "active_points": np.array([k.p for k in keys], dtype=float).reshape(len(keys), -1),
+        "active_node": np.array([rows[id(zoom.active_points[k])] for k in keys], dtype=np.int64),
+        "pulled_times": np.array([zoom.pulled_times[k] for k in keys], dtype=np.int64),
+        "squared_rewards": np.array([zoom.squared_rewards.get(k, 0.0) for k in keys], dtype=float),
+        "proposer_arm": np.array(list(wrapper.points_by_index), dtype=np.int64),
+        "proposer_point": np.array([k.p for k in wrapper.points_by_index.values()], dtype=float).reshape(len(wrapper.points_by_index), -1),
+        "archived_points": zoom.archived_points,
+        "archived_stats": zoom.archived_stats,
+        "archived_node": np.array([rows[id(node)] for node in zoom.archived_nodes], dtype=np.int64),
+    }
+    if bernoulli:
+        arrays["successes"] = np.array([zoom.successes[k] for k in keys], dtype=np.int64)
+        arrays["failures"] = np.array([zoom.failures[k] for k in keys], dtype=np.int64)
+    else:
+        arrays["average_rewards"] = np.array([zoom.average_rewards[k] for k in keys], dtype=float)
+    return meta, arrays
+
+def _restore_zooming(meta, arrays, f):
+    from scipy.spatial import KDTree
+    from PyXAB.partition.Node import P_node
+    from .zooming import Zooming, DiscreteZoomingWrapper, point
+    from .zoomin_bandit import CustomObjective
+
+    module, _, cls_name = meta["partition_class"].rpartition(".")
+    partition_cls = getattr(importlib.import_module(module), cls_name)
+    partition = partition_cls.__new__(partition_cls)
+    partition.domain = meta["domain"]
+    partition.node = P_node
+    partition.depth = meta["partition_depth"]
+    partition.node_list = [[] for _ in range(partition.depth + 1)]
+    nodes = []
+    for depth, index, parent_row, domain in zip(arrays["node_depth"], arrays["node_index"],
+                                                arrays["node_parent"], arrays["node_domain"]):
+        parent = nodes[parent_row] if parent_row >= 0 else None
+        node = P_node(int(depth), int(index), parent, domain.tolist())
+        if parent is not None:
+            parent.update_children((parent.get_children() or []) + [node])
+        partition.node_list[int(depth)].append(node)
+        nodes.append(node)
+    partition.root = nodes[0]
+
+    if not isinstance(f, CustomObjective):
+        f = CustomObjective(f)
+
+    zoom = Zooming.__new__(Zooming)
+    zoom.partition = partition
+    for k in ("iteration", "nu", "rho", "phase", "next_end_time", "time",
+              "scoring_method", "reward_type", "min_pulls_before_zoom"):
+        setattr(zoom, k, meta[k])
+    if meta["locked_in_step"] is not None:
+        zoom.locked_in_step = meta["locked_in_step"]
+    keys = [point(p) for p in arrays["active_points"]]
+    zoom.active_points = {k: nodes[row] for k, row in zip(keys, arrays["active_node"])}
+    zoom.pulled_times = dict(zip(keys, arrays["pulled_times"].tolist()))
+    zoom.squared_rewards = dict(zip(keys, arrays["squared_rewards"].tolist()))
+    if meta["reward_type"] == "bernoulli":
+        zoom.successes = dict(zip(keys, arrays["successes"].tolist()))
+        zoom.failures = dict(zip(keys, arrays["failures"].tolist()))
+    else:
+        zoom.average_rewards = dict(zip(keys, arrays["average_rewards"].tolist()))
+    zoom.best_arm = None if meta["best_arm"] is None else point(meta["best_arm"])
+    # format 1 checkpoints predate pruning
+    zoom.prune = meta.get("prune", False)
+    zoom.prune_every = meta.get("prune_every", 50)
+    zoom.prune_sigma = meta.get("prune_sigma")
+    zoom.n_pruned = meta.get("n_pruned", 0)
+    zoom.n_restored = meta.get("n_restored", 0)
+    d = len(meta["domain"])
+    zoom.archived_points = np.asarray(arrays.get("archived_points", np.empty((0, d))))
+    zoom.archived_stats = np.asarray(arrays.get("archived_stats", np.empty((0, 4))))
+    zoom.archived_nodes = [nodes[row] for row in arrays.get("archived_node", [])]
+
+    wrapper = DiscreteZoomingWrapper.__new__(DiscreteZoomingWrapper)
+    for k in ("nu", "rho", "domain", "scoring_method", "reward_type", "min_pulls_before_zoom"):
+        setattr(wrapper, k, meta[k])
+    wrapper.prune = zoom.prune
+    wrapper.prune_every = zoom.prune_every
+    wrapper.prune_sigma = zoom.prune_sigma
+    wrapper.f = f
+    wrapper.arms = np.asarray(arrays["arms"])
+    wrapper.zoom = zoom
+    wrapper.tree = KDTree(wrapper.arms)
+    zoom.f = f
+    zoom.arms = wrapper.arms
+    zoom.tree = wrapper.tree
+    wrapper.points_by_index = {int(a): point(p) for a, p in zip(arrays["proposer_arm"], arrays["proposer_point"])}
+    if meta["last_selected_index"] is not None:
+        wrapper.last_selected_index = meta["last_selected_index"]
+        wrapper.last_selected_point = wrapper.arms[wrapper.last_selected_index]
+    return wrapper
+
+def save_checkpoint(algo, path) -> None:
+    """
+    Write a policy's state to a checkpoint directory.
+
+    Parameters
+    ----------
+    algo : object
+        A standard, GP or Zoom-In policy from this package
+    path : str
+        Directory to write to (created if missing, existing files overwritten)
+    """
+    name = type(algo).__name__
+    if name in _FLAT_STATE:
+        meta, arrays = _flat_state(algo, name)
+    elif name in _GP_PARAMS:
+        meta, arrays = _gp_state(algo, name)
+    elif name == "DiscreteZoomingWrapper":
+        meta, arrays = _zooming_state(algo)
+    else:
+        raise TypeError(f"No checkpoint format for policy class {name}")
+
+    os.makedirs(path, exist_ok=True)
+    for key, value in arrays.items():
+        np.save(os.path.join(path, f"{key}.npy"), np.ascontiguousarray(value))
+    header = {"format_version": FORMAT_VERSION, "policy": name, "arrays": sorted(arrays), "meta": meta}
+    # meta.json is written last, so a directory without it is an incomplete save
+    tmp = os.path.join(path, "meta.json.tmp")
+    with open(tmp, "w") as fh:
+        json.dump(header, fh)
+    os.replace(tmp, os.path.join(path, "meta.json"))
+
+def load_checkpoint(path, f=None, mmap=True):
+    """
+    Rebuild a policy from a checkpoint directory.
+
+    Parameters
+    ----------
+    path : str
+        Directory written by `save_checkpoint`
+    f : callable, optional
+        Reward function; required for Zoom-In policies, whose make_active
+        evaluates it when new regions are activated
+    mmap : bool
+        Memory-map the arrays copy-on-write instead of reading them, so a
+        restore costs only the metadata until the arrays are touched
+
+    Returns
+    -------
+    object
+        The restored policy
+    """
+    with open(os.path.join(path, "meta.json")) as fh:
+        header = json.load(fh)
+    if header["format_version"] > FORMAT_VERSION:
+        raise ValueError(f"Checkpoint format {header['format_version']} is newer than supported ({FORMAT_VERSION})")
+    name, meta = header["policy"], header["meta"]
+    arrays = {k: np.load(os.path.join(path, f"{k}.npy"), mmap_mode="c" if mmap else None)
+              for k in header["arrays"]}
+
+    if name in _FLAT_STATE:
+        from . import standard_bandits
+        algo = getattr(standard_bandits, name).__new__(getattr(standard_bandits, name))
+        for k, v in meta.items():
+            setattr(algo, k, v)
+        for k, v in arrays.items():
+            setattr(algo, k, v)
+        return algo
+    if name in _GP_PARAMS:
+        from . import gp_bandits
+        algo = getattr(gp_bandits, name)(arrays["arms"], **meta)
+        algo.X = list(np.asarray(arrays["X"]))
+        algo.y = np.asarray(arrays["y"]).tolist()
+        return algo
+    if name == "DiscreteZoomingWrapper":
+        if f is None:
+            raise ValueError("Restoring a Zoom-In policy requires its reward function f")
+        return _restore_zooming(meta, arrays, f)
+    raise TypeError(f"No checkpoint format for policy class {name}")
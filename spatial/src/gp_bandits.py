@@ -3,12 +3,16 @@ from sklearn.gaussian_process import GaussianProcessRegressor
 from sklearn.gaussian_process.kernels import RBF
 
 class GaussianProcessUCB:
-    def __init__(self, arms, beta=2.0, noise=0.1, length_scale=0.2, use_log_beta=False, delta=0.1, D=1.0):
+    def __init__(self, arms, beta=2.0, noise=0.1, length_scale=0.2, use_log_beta=False, delta=0.1, D=1.0,
+                 optimizer="fmin_l_bfgs_b"):
         self.arms = np.array(arms)
         self.beta = beta
         self.noise = noise
+        self.optimizer = optimizer
         self.kernel = RBF(length_scale)
-        self.gp = GaussianProcessRegressor(kernel=self.kernel, alpha=noise**2)
+        # the default optimizer refits length_scale on every fit; None keeps
+        # it fixed, as the batched backend in gp_batched.py does
+        self.gp = GaussianProcessRegressor(kernel=self.kernel, alpha=noise**2, optimizer=optimizer)
         self.X = []
         self.y = []
         self.use_log_beta = use_log_beta
@@ -33,11 +37,12 @@ class GaussianProcessUCB:
 
 
 class GaussianProcessTS:
-    def __init__(self, arms, noise=0.1, length_scale=0.2):
+    def __init__(self, arms, noise=0.1, length_scale=0.2, optimizer="fmin_l_bfgs_b"):
         self.arms = np.array(arms)
         self.noise = noise
+        self.optimizer = optimizer
         self.kernel = RBF(length_scale)
-        self.gp = GaussianProcessRegressor(kernel=self.kernel, alpha=noise**2)
+        self.gp = GaussianProcessRegressor(kernel=self.kernel, alpha=noise**2, optimizer=optimizer)
         self.X = []
         self.y = []
 
@@ -48,6 +53,14 @@ class GaussianProcessTS:
         sampled_f = self.gp.sample_y(self.arms, random_state=None).flatten()
         return np.argmax(sampled_f)
 
+    def select_arms(self, n, t=None):
+        # One fit and one joint draw of n posterior samples instead of n fits
+        if not self.X:
+            return np.random.choice(len(self.arms), size=n)
+        self.gp.fit(np.array(self.X), np.array(self.y))
+        sampled_f = self.gp.sample_y(self.arms, n_samples=n, random_state=None)
+        return np.argmax(sampled_f, axis=0)
+
     def update(self, arm_idx, reward):
         self.X.append(self.arms[arm_idx])
         self.y.append(reward)
\ No newline at end of file
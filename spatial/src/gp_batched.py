@@ -0,0 +1,229 @@
+import numpy as np
+
+# Batched counterpart of gp_bandits.py: R runs times V kernel variants are
+# stacked into one batch of B = R * V independent GPs (b = r * V + v) with
+# fixed hyperparameters, as sklearn's GaussianProcessRegressor with
+# `optimizer=None`. GaussianProcessUCB/TS refit length_scale by maximum
+# likelihood on every step by default, so they match this backend only when
+# built with `optimizer=None`.
+#
+# Since observations are always at arm positions, the posterior is kept in
+# the form v = L^-1 k(X, arms) and z = L^-1 y, where L is the Cholesky factor
+# of k(X, X) + noise^2 I. Appending an observation adds one row to L, v and z,
+# and the column of v at the pulled arm is exactly the new row of L, so each
+# timestep is a single O(n K) batched update instead of a refit.
+
+def _torch():
+    try:
+        import torch
+    except ImportError as e:
+        raise ImportError("The batched GP backend requires torch (pip install torch)") from e
+    return torch
+
+class BatchedGaussianProcessBandit:
+    def __init__(self, arms, variants=({},), acquisition="ucb", horizon=1000, beta=2.0, noise=0.1,
+                 length_scale=0.2, use_log_beta=False, delta=0.1, n_threads=None, seed=None) -> None:
+        """
+        GP-UCB or GP-TS over a batch of runs and kernel variants, updated
+        with one batched tensor call per timestep.
+
+        The kernel hyperparameters stay fixed at the given values, so this is
+        the counterpart of `GaussianProcessUCB` and `GaussianProcessTS` with
+        `optimizer=None`, not of their default, which refits `length_scale`
+        on every step.
+
+        Parameters
+        ----------
+        arms : np.ndarray
+            Arm positions, shared (shape: [K, D]) or per run (shape: [R, K, D])
+        variants : sequence of dict
+            Per-variant overrides of `beta`, `noise` and `length_scale`
+        acquisition : str
+            "ucb" or "ts"
+        horizon : int
+            Maximum number of observations per GP
+        beta, noise, length_scale : float
+            Defaults for the variants, as in `GaussianProcessUCB`
+        use_log_beta : bool
+            Use beta_t = 2 log(K t^2 pi^2 / (6 delta)) instead of `beta`
+        delta : float
+            Confidence parameter of the log schedule
+        n_threads : int, optional
+            Intra-op threads for torch (a process-wide setting)
+        seed : int, optional
+            Seed of the generator used for the first pulls and TS draws
+        """
+        torch = _torch()
+        if acquisition not in ("ucb", "ts"):
+            raise ValueError(f"Unknown acquisition {acquisition!r}")
+        if n_threads:
+            torch.set_num_threads(n_threads)
+        self.torch = torch
+        self.acquisition = acquisition
+        self.use_log_beta = use_log_beta
+        self.delta = delta
+
+        dtype = torch.float64
+        arms = torch.as_tensor(np.asarray(arms), dtype=dtype)
+        if arms.ndim == 2:
+            arms = arms[None]
+        self.n_runs, self.K, _ = arms.shape
+        self.n_variants = len(variants)
+        self.B = self.n_runs * self.n_variants
+        defaults = {"beta": beta, "noise": noise, "length_scale": length_scale}
+        params = {k: torch.tensor([v.get(k, d) for v in variants], dtype=dtype).repeat(self.n_runs)
+                  for k, d in defaults.items()}
+        self.beta = params["beta"]
+        self.noise = params["noise"]
+        self.length_scale = params["length_scale"]
+        self.arms = arms.repeat_interleave(self.n_variants, dim=0)
+
+        self.horizon = horizon
+        self.v = torch.zeros(self.B, horizon, self.K, dtype=dtype)
+        self.z = torch.zeros(self.B, horizon, dtype=dtype)
+        self.mean = torch.zeros(self.B, self.K, dtype=dtype)
+        self.var = torch.ones(self.B, self.K, dtype=dtype)
+        self.n = 0
+        self.generator = torch.Generator()
+        if seed is None:
+            self.generator.seed()
+        else:
+            self.generator.manual_seed(seed)
+        self._rows = torch.arange(self.B)
+
+    def _kernel_rows(self, idx):
+        # k(x_idx, arms) for every batch member (shape: [B, K])
+        x = self.arms[self._rows, idx]
+        sq = ((self.arms - x[:, None, :]) ** 2).sum(-1)
+        return self.torch.exp(-0.5 * sq / self.length_scale[:, None] ** 2)
+
+    def _prior_cov(self):
+        sq = self.torch.cdist(self.arms, self.arms) ** 2
+        return self.torch.exp(-0.5 * sq / self.length_scale[:, None, None] ** 2)
+
+    def posterior(self) -> tuple:
+        """
+        Returns
+        -------
+        tuple of np.ndarray
+            Posterior mean and standard deviation at every arm (shape: [B, K])
+        """
+        return self.mean.numpy().copy(), self.var.sqrt().numpy()
+
+    def select_arms(self, t=None) -> np.ndarray:
+        """
+        Parameters
+        ----------
+        t : int, optional
+            Timestep for the log-beta schedule (default: number of updates)
+
+        Returns
+        -------
+        np.ndarray
+            Chosen arm of every batch member (shape: [B])
+        """
+        torch = self.torch
+        if self.n == 0:
+            return torch.randint(self.K, (self.B,), generator=self.generator).numpy()
+        if self.acquisition == "ucb":
+            beta = self.beta
+            t = self.n if t is None else t
+            if self.use_log_beta and t > 0:
+                beta = torch.full_like(beta, 2 * np.log(self.K * t**2 * np.pi**2 / (6 * self.delta)))
+            score = self.mean + beta.sqrt()[:, None] * self.var.sqrt()
+        else:
+            v = self.v[:, :self.n]
+            cov = self._prior_cov() - v.transpose(1, 2) @ v
+            eye = torch.eye(self.K, dtype=cov.dtype)
+            jitter = 1e-10
+            while True:
+                L, info = torch.linalg.cholesky_ex(cov + jitter * eye)
+                if not info.any() or jitter > 1e-2:
+                    break
+                jitter *= 10
+            eps = torch.randn(self.B, self.K, 1, generator=self.generator, dtype=cov.dtype)
+            score = self.mean + (L @ eps)[..., 0]
+        return score.argmax(dim=1).numpy()
+
+    def update(self, arm_idx, rewards) -> None:
+        """
+        Parameters
+        ----------
+        arm_idx : np.ndarray
+            Pulled arm of every batch member (shape: [B])
+        rewards : np.ndarray
+            Observed rewards (shape: [B])
+        """
+        torch = self.torch
+        if self.n >= self.horizon:
+            raise RuntimeError(f"Horizon of {self.horizon} observations exceeded")
+        idx = torch.as_tensor(np.asarray(arm_idx), dtype=torch.int64)
+        y = torch.as_tensor(np.asarray(rewards), dtype=self.v.dtype)
+        n = self.n
+        v = self.v[:, :n]
+        l = v[self._rows, :, idx]
+        d = (1.0 + self.noise**2 - (l**2).sum(1)).clamp_min(1e-12).sqrt()
+        row = (self._kernel_rows(idx) - torch.einsum("bn,bnk->bk", l, v)) / d[:, None]
+        z_new = (y - (l * self.z[:, :n]).sum(1)) / d
+        self.v[:, n] = row
+        self.z[:, n] = z_new
+        self.mean += row * z_new[:, None]
+        self.var -= row**2
+        self.var.clamp_(min=0.0)
+        self.n += 1
+
+def run_batched_gp(X, mu, T, sigma=0.1, variants=({},), acquisition="ucb", seed=0, n_threads=None, **params) -> dict:
+    """
+    Simulate GP-UCB or GP-TS on R ground truths for every kernel variant at
+    once.
+
+    The hyperparameters of each variant are fixed (see
+    `BatchedGaussianProcessBandit`), so the results correspond to
+    `GaussianProcessUCB` and `GaussianProcessTS` with `optimizer=None`.
+
+    Parameters
+    ----------
+    X : np.ndarray
+        Arm positions per run (shape: [R, K, D])
+    mu : np.ndarray
+        True expected rewards per run (shape: [R, K])
+    T : int
+        Horizon
+    sigma : float
+        Standard deviation of the reward noise
+    variants : sequence of dict
+        Kernel variants, see `BatchedGaussianProcessBandit`
+    acquisition : str
+        "ucb" or "ts"
+    seed : int
+        Seed of the reward noise and of the policies
+    n_threads : int, optional
+        Intra-op threads for torch
+    **params
+        Further arguments for `BatchedGaussianProcessBandit`
+
+    Returns
+    -------
+    dict
+        `arm`, `regret` (instantaneous) and `distance` arrays
+        (shape: [R, V, T])
+    """
+    X, mu = np.asarray(X), np.asarray(mu)
+    bandit = BatchedGaussianProcessBandit(X, variants, acquisition, horizon=T, n_threads=n_threads,
+                                          seed=seed, **params)
+    R, V, B = bandit.n_runs, bandit.n_variants, bandit.B
+    rng = np.random.default_rng(seed)
+    mu_b = np.repeat(mu, V, axis=0)
+    X_b = np.repeat(X, V, axis=0)
+    rows = np.arange(B)
+    best = mu_b.argmax(axis=1)
+    arms = np.empty((B, T), dtype=np.int64)
+    regret = np.empty((B, T))
+    distance = np.empty((B, T))
+    for t in range(T):
+        a = bandit.select_arms(t)
+        bandit.update(a, mu_b[rows, a] + sigma * rng.standard_normal(B))
+        arms[:, t] = a
+        regret[:, t] = mu_b[rows, best] - mu_b[rows, a]
+        distance[:, t] = np.linalg.norm(X_b[rows, a] - X_b[rows, best], axis=1)
+    return {k: v.reshape(R, V, T) for k, v in (("arm", arms), ("regret", regret), ("distance", distance))}
@@ -0,0 +1,181 @@
+import functools
+import time
+
+# Instrumentation works by wrapping methods on individual policy *instances*
+# (never on the classes), so a policy that was not passed to `instrument` runs
+# exactly the code it would run without this module.
+
+class PolicyProfile:
+    def __init__(self) -> None:
+        """
+        Timers, counters and gauges collected for one policy in one run.
+        """
+        self.timers = {}
+        self.counters = {}
+        self.gauges = {}
+
+    def add_time(self, name: str, seconds: float) -> None:
+        entry = self.timers.get(name)
+        if entry is None:
+            self.timers[name] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name: str, value: float) -> None:
+        entry = self.gauges.get(name)
+        if entry is None:
+            self.gauges[name] = [value, value]
+        else:
+            entry[0] = value
+            entry[1] = max(entry[1], value)
+
+    def summary(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            `timers` (calls, total seconds, mean microseconds per call),
+            `counters` and `gauges` (last and maximum value)
+        """
+        return {
+            "timers": {k: {"calls": n, "total_s": s, "mean_us": 1e6 * s / n} for k, (n, s) in self.timers.items()},
+            "counters": dict(self.counters),
+            "gauges": {k: {"last": last, "max": peak} for k, (last, peak) in self.gauges.items()},
+        }
+
+def _timed(profile, name, fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            profile.add_time(name, time.perf_counter() - start)
+    return wrapper
+
+_MISSING = object()
+
+def _patch(obj, attr, wrapper_factory):
+    saved = obj.__dict__.setdefault("_profiled_attrs", {})
+    saved.setdefault(attr, obj.__dict__.get(attr, _MISSING))
+    setattr(obj, attr, wrapper_factory(getattr(obj, attr)))
+
+def instrument(algo, profile=None) -> PolicyProfile:
+    """
+    Attach timers and counters to a policy instance.
+
+    Always timed: `select_arm` and `update` (or `receive_reward`). GP policies
+    also time `gp.fit`, `gp.predict` and `gp.sample_y` (note that sklearn's
+    sample_y calls predict, so the two overlap). The Zoom-In wrapper also
+    times `pull`, `make_active` and `KDTree.query`, counts splits and
+    reward-function evaluations, and tracks active-set size and partition
+    depth.
+
+    Parameters
+    ----------
+    algo : object
+        Any policy from this package
+    profile : PolicyProfile, optional
+        Profile to record into; a new one is created if omitted
+
+    Returns
+    -------
+    PolicyProfile
+        The profile the policy now records into
+    """
+    profile = profile or PolicyProfile()
+    _patch(algo, "select_arm", lambda fn: _timed(profile, "select", fn))
+    for attr in ("update", "receive_reward"):
+        if hasattr(algo, attr):
+            _patch(algo, attr, lambda fn: _timed(profile, "update", fn))
+
+    gp = getattr(algo, "gp", None)
+    if gp is not None:
+        for attr in ("fit", "predict", "sample_y"):
+            _patch(gp, attr, lambda fn, attr=attr: _timed(profile, f"gp.{attr}", fn))
+
+    zoom = getattr(algo, "zoom", None)
+    if zoom is not None:
+        def counting_f(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                profile.count("f_evals")
+                return fn(*args, **kwargs)
+            return wrapper
+
+        def counting_split(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                profile.count("splits")
+                return fn(*args, **kwargs)
+            return wrapper
+
+        def tracking_reward(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                result = fn(*args, **kwargs)
+                profile.gauge("active_points", len(zoom.active_points))
+                profile.gauge("partition_depth", zoom.partition.get_depth())
+                return result
+            return wrapper
+
+        _patch(zoom, "f", counting_f)
+        _patch(zoom, "pull", lambda fn: _timed(profile, "zoom.pull", fn))
+        _patch(zoom, "make_active", lambda fn: _timed(profile, "zoom.make_active", fn))
+        _patch(zoom, "receive_reward", tracking_reward)
+        _patch(zoom.partition, "make_children", counting_split)
+        _patch(algo.tree, "query", lambda fn: _timed(profile, "kdtree.query", fn))
+    return profile
+
+def uninstrument(algo) -> None:
+    """
+    Remove everything `instrument` attached to a policy instance.
+    """
+    targets = [algo, getattr(algo, "gp", None)]
+    zoom = getattr(algo, "zoom", None)
+    if zoom is not None:
+        targets += [zoom, zoom.partition, algo.tree]
+    for obj in targets:
+        if obj is None:
+            continue
+        attrs = obj.__dict__.pop("_profiled_attrs", {})
+        for attr, original in attrs.items():
+            if original is _MISSING:
+                del obj.__dict__[attr]
+            else:
+                setattr(obj, attr, original)
+
+def aggregate_profiles(summaries) -> dict:
+    """
+    Combine per-run profile summaries of one policy.
+
+    Parameters
+    ----------
+    summaries : list of dict
+        Outputs of `PolicyProfile.summary`
+
+    Returns
+    -------
+    dict
+        Summed timers and counters; gauges keep the mean of the final values
+        and the overall maximum
+    """
+    timers, counters, gauges = {}, {}, {}
+    for s in summaries:
+        for k, v in s["timers"].items():
+            calls, total = timers.get(k, (0, 0.0))
+            timers[k] = (calls + v["calls"], total + v["total_s"])
+        for k, v in s["counters"].items():
+            counters[k] = counters.get(k, 0) + v
+        for k, v in s["gauges"].items():
+            gauges.setdefault(k, []).append((v["last"], v["max"]))
+    return {
+        "runs": len(summaries),
+        "timers": {k: {"calls": n, "total_s": t, "mean_us": 1e6 * t / n} for k, (n, t) in timers.items()},
+        "counters": counters,
+        "gauges": {k: {"mean_last": sum(l for l, _ in v) / len(v), "max": max(m for _, m in v)} for k, v in gauges.items()},
+    }
@@ -0,0 +1,204 @@
+import os
+import numpy as np
+
+from .adapters import select_index, update_policy
+from .regret import RegretTracker
+
+LOG_COLUMNS = ("arm", "reward", "propensity")
+
+def iter_log_chunks(path, chunksize=100_000, columns=LOG_COLUMNS):
+    """
+    Stream a log of (arm, reward, propensity) events from disk in chunks.
+
+    Supported sources are CSV files, Parquet files (needs pyarrow), `.npz`
+    archives and directories holding one `.npy` file per column. `.npy`
+    columns are memory-mapped; members of an `.npz` archive are read whole,
+    so use a `.npy` directory for logs that do not fit in memory.
+
+    Parameters
+    ----------
+    path : str
+        Location of the log
+    chunksize : int
+        Number of events per chunk
+    columns : tuple of str
+        Names of the arm, reward and propensity columns
+
+    Yields
+    ------
+    tuple of np.ndarray
+        Arms (int64), rewards (float64) and propensities (float64) of one chunk
+    """
+    arm_col, reward_col, prop_col = columns
+
+    def as_chunk(arms, rewards, props):
+        return (np.asarray(arms, dtype=np.int64),
+                np.asarray(rewards, dtype=np.float64),
+                np.asarray(props, dtype=np.float64))
+
+    if os.path.isdir(path):
+        cols = [np.load(os.path.join(path, f"{c}.npy"), mmap_mode="r") for c in columns]
+        for start in range(0, len(cols[0]), chunksize):
+            yield as_chunk(*(c[start:start + chunksize] for c in cols))
+    elif path.endswith(".npz"):
+        with np.load(path) as data:
+            cols = [data[c] for c in columns]
+        for start in range(0, len(cols[0]), chunksize):
+            yield as_chunk(*(c[start:start + chunksize] for c in cols))
+    elif path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=list(columns)):
+            yield as_chunk(*(batch.column(c).to_numpy() for c in columns))
+    elif path.endswith(".csv"):
+        import pandas as pd
+        for frame in pd.read_csv(path, usecols=list(columns), chunksize=chunksize):
+            yield as_chunk(frame[arm_col].to_numpy(), frame[reward_col].to_numpy(), frame[prop_col].to_numpy())
+    else:
+        raise ValueError(f"Unsupported log format: {path}")
+
+
+class ReplayResult:
+    def __init__(self, name, true_means=None, arm_positions=None) -> None:
+        """
+        Running totals of one policy's offline evaluation.
+
+        Parameters
+        ----------
+        name : str
+            Name of the evaluated policy
+        true_means : np.ndarray, optional
+            True expected reward of each arm (shape: [K]). Only known for
+            semi-synthetic logs; enables a RegretTracker over matched events.
+        arm_positions : np.ndarray, optional
+            Arm positions (shape: [K, D]) for the tracker's distances
+        """
+        self.name = name
+        self.n_events = 0
+        self.n_matched = 0
+        self.reward_sum = 0.0
+        self.ips_sum = 0.0
+        self.ips_sq_sum = 0.0
+        self.checkpoints = []
+        self.tracker = None
+        if true_means is not None:
+            if arm_positions is None:
+                arm_positions = np.zeros((len(true_means), 1))
+            self.tracker = RegretTracker(true_means, arm_positions)
+
+    def replay_value(self) -> float:
+        """
+        Returns
+        -------
+        float
+            Average reward over the events where the policy matched the log
+        """
+        return self.reward_sum / self.n_matched if self.n_matched else np.nan
+
+    def ips_value(self) -> float:
+        """
+        Returns
+        -------
+        float
+            Inverse-propensity-scored estimate of the policy's average reward
+        """
+        return self.ips_sum / self.n_events if self.n_events else np.nan
+
+    def ips_std_error(self) -> float:
+        """
+        Returns
+        -------
+        float
+            Standard error of the IPS estimate
+        """
+        if self.n_events < 2:
+            return np.nan
+        mean = self.ips_sum / self.n_events
+        var = max(self.ips_sq_sum / self.n_events - mean**2, 0.0)
+        return np.sqrt(var / (self.n_events - 1))
+
+    def get_checkpoints(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            Arrays of events seen, matched events, cumulative reward and IPS
+            value at the end of every chunk
+        """
+        cols = np.array(self.checkpoints, dtype=float).reshape(-1, 4)
+        return {
+            "events": cols[:, 0].astype(np.int64),
+            "matched": cols[:, 1].astype(np.int64),
+            "cumulative_reward": cols[:, 2],
+            "ips_value": cols[:, 3],
+        }
+
+
+class ReplayEvaluator:
+    def __init__(self, policies: dict, true_means=None, arm_positions=None) -> None:
+        """
+        Offline evaluation of several policies in one pass over a logged dataset.
+
+        Every logged event is offered to every policy. A policy whose choice
+        matches the logged arm is updated with the logged reward and advances
+        its own clock (replay method); all events contribute to the IPS
+        estimate. Only the current chunk and per-policy totals are held in
+        memory, except for the optional RegretTracker, which grows with the
+        number of matched events.
+
+        Parameters
+        ----------
+        policies : dict
+            Mapping from name to an initialised policy
+        true_means : np.ndarray, optional
+            True expected reward of each arm, if known
+        arm_positions : np.ndarray, optional
+            Arm positions (shape: [K, D])
+        """
+        self.policies = policies
+        self.clocks = {name: 0 for name in policies}
+        self.results = {name: ReplayResult(name, true_means, arm_positions) for name in policies}
+
+    def process_chunk(self, arms, rewards, propensities) -> None:
+        """
+        Replay one chunk of logged events through all policies.
+        """
+        for name, algo in self.policies.items():
+            res = self.results[name]
+            t = self.clocks[name]
+            for logged_arm, reward, prop in zip(arms, rewards, propensities):
+                a_t = select_index(algo, t)
+                if a_t == logged_arm:
+                    update_policy(algo, a_t, reward, t)
+                    t += 1
+                    res.n_matched += 1
+                    res.reward_sum += reward
+                    weighted = reward / prop
+                    res.ips_sum += weighted
+                    res.ips_sq_sum += weighted**2
+                    if res.tracker is not None:
+                        res.tracker.update(a_t)
+            res.n_events += len(arms)
+            self.clocks[name] = t
+            res.checkpoints.append((res.n_events, res.n_matched, res.reward_sum, res.ips_value()))
+
+    def run(self, path, chunksize=100_000, columns=LOG_COLUMNS) -> dict:
+        """
+        Evaluate all policies on a log stored on disk.
+
+        Parameters
+        ----------
+        path : str
+            Location of the log, see `iter_log_chunks`
+        chunksize : int
+            Number of events held in memory at once
+        columns : tuple of str
+            Names of the arm, reward and propensity columns
+
+        Returns
+        -------
+        dict
+            Mapping from policy name to its ReplayResult
+        """
+        for arms, rewards, propensities in iter_log_chunks(path, chunksize, columns):
+            self.process_chunk(arms, rewards, propensities)
+        return self.results
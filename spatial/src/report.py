@@ -0,0 +1,173 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+# Figures are drawn on bare Agg canvases (never through pyplot), so rendering
+# works on headless nodes and does not touch the backend of a running notebook.
+# Confidence bands come from per-timestep t-intervals over runs instead of
+# seaborn's bootstrap, and curves are bucket-averaged down to roughly one
+# point per output pixel before they are handed to the workers.
+
+FIGURES = {
+    "cumulative_regret": "Average Cumulative Regret",
+    "cumulative_regret_logit": "Logit-Scaled Cumulative Regret",
+    "instantaneous_regret": "Average Instantaneous Regret",
+    "distance_to_best_arm": "Average Distance to Best Arm",
+}
+
+def _mean_ci(values, level):
+    from scipy import stats
+
+    n = values.shape[0]
+    mean = values.mean(axis=0)
+    if n < 2:
+        return mean, mean, mean
+    half = stats.t.ppf(0.5 + level / 2, n - 1) * values.std(axis=0, ddof=1) / np.sqrt(n)
+    return mean, mean - half, mean + half
+
+def aggregate_curves(source, algorithms=None, level=0.95) -> dict:
+    """
+    Per-timestep mean and confidence interval of every standard metric.
+
+    Parameters
+    ----------
+    source : ComparisonResult or TrajectoryStore
+        Per-run trajectories
+    algorithms : list of str, optional
+        Subset and order of algorithms (default: all)
+    level : float
+        Confidence level
+
+    Returns
+    -------
+    dict
+        metric -> algorithm -> (mean, lower, upper) arrays (shape: [T])
+    """
+    names = list(algorithms or getattr(source, "names", None) or source.algorithms)
+    curves = {"cumulative_regret": {}, "instantaneous_regret": {}, "distance_to_best_arm": {}}
+    for name in names:
+        if hasattr(source, "regrets"):
+            inst, dist = source.regrets[name], source.distances[name]
+        else:
+            inst, dist = source.load(name, "regret"), source.load(name, "distance")
+        curves["cumulative_regret"][name] = _mean_ci(np.cumsum(inst, axis=1), level)
+        curves["instantaneous_regret"][name] = _mean_ci(np.asarray(inst), level)
+        curves["distance_to_best_arm"][name] = _mean_ci(np.asarray(dist), level)
+    return curves
+
+def downsample(arrays, max_points) -> tuple:
+    """
+    Average consecutive timesteps into at most `max_points` buckets.
+
+    Parameters
+    ----------
+    arrays : tuple of np.ndarray
+        Curves of equal length T (time 1..T)
+    max_points : int
+        Number of buckets
+
+    Returns
+    -------
+    tuple
+        Bucket-mean times followed by the bucket-mean curves
+    """
+    T = len(arrays[0])
+    time = np.arange(1, T + 1, dtype=float)
+    if T <= max_points:
+        return (time,) + tuple(arrays)
+    starts = np.linspace(0, T, max_points, endpoint=False).astype(np.int64)
+    sizes = np.diff(np.append(starts, T))
+    return tuple(np.add.reduceat(a, starts) / sizes for a in (time,) + tuple(arrays))
+
+def _logit_curves(curves):
+    from scipy.special import logit
+
+    # same scaling as plot_cumulative_regret_logit, applied to the mean curves
+    max_regret = max(mean.max() for mean, _, _ in curves.values())
+    eps = 1e-5
+    scale = lambda a: logit(np.clip(a, eps, max_regret - eps) / max_regret)
+    return {name: tuple(scale(a) for a in band) for name, band in curves.items()}
+
+def _render(path, ylabel, series, colors, figsize, dpi, band_alpha) -> str:
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    for name, (time, mean, lower, upper) in series.items():
+        ax.plot(time, mean, label=name, color=colors.get(name))
+        ax.fill_between(time, lower, upper, color=colors.get(name), alpha=band_alpha, linewidth=0)
+    ax.set_xlabel("Time Step")
+    ax.set_ylabel(ylabel)
+    ax.legend(title=None, loc="upper center", bbox_to_anchor=(0.5, -0.15), ncol=len(series), frameon=False)
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    fig.tight_layout()
+    fig.savefig(path, dpi=dpi)
+    return path
+
+def render_report(source, out_dir, figures=None, algorithms=None, palette=None, formats=("png",),
+                  figsize=(8, 5), dpi=150, max_points=None, level=0.95, band_alpha=0.2, n_jobs=None) -> list:
+    """
+    Render the standard figures of a comparison to files, in parallel.
+
+    Parameters
+    ----------
+    source : ComparisonResult or TrajectoryStore
+        Per-run trajectories
+    out_dir : str
+        Output directory (created if missing)
+    figures : list of str, optional
+        Subset of `FIGURES` (default: all)
+    algorithms : list of str, optional
+        Subset and order of algorithms (default: all)
+    palette : dict, optional
+        Algorithm -> colour; by default colours follow the matplotlib cycle
+        in algorithm order, identically in every figure
+    formats : tuple of str
+        File formats, e.g. ("png", "pdf")
+    figsize : tuple
+        Figure size in inches
+    dpi : int
+        Output resolution
+    max_points : int, optional
+        Points per curve (default: figure width in pixels)
+    level : float
+        Confidence level of the bands
+    band_alpha : float
+        Opacity of the bands
+    n_jobs : int, optional
+        Worker processes (default: one per figure, up to the core count);
+        1 renders in-process
+
+    Returns
+    -------
+    list of str
+        Paths of the written files
+    """
+    from matplotlib import rcParams
+
+    figures = list(figures or FIGURES)
+    curves = aggregate_curves(source, algorithms, level)
+    curves["cumulative_regret_logit"] = _logit_curves(curves["cumulative_regret"])
+    names = list(curves["cumulative_regret"])
+    cycle = rcParams["axes.prop_cycle"].by_key()["color"]
+    colors = {name: cycle[i % len(cycle)] for i, name in enumerate(names)}
+    colors.update(palette or {})
+    max_points = max_points or int(figsize[0] * dpi)
+
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = []
+    for fig_name in figures:
+        series = {name: downsample(band, max_points) for name, band in curves[fig_name].items()}
+        for fmt in formats:
+            path = os.path.join(out_dir, f"{fig_name}.{fmt}")
+            jobs.append((path, FIGURES[fig_name], series, colors, figsize, dpi, band_alpha))
+
+    n_jobs = n_jobs or min(len(jobs), os.cpu_count())
+    if n_jobs <= 1:
+        return [_render(*job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+        return list(pool.map(_render, *zip(*jobs)))
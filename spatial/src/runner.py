@@ -0,0 +1,520 @@
+import time
+import numpy as np
+
+from .adapters import select_index, update_policy
+from .profiling import instrument, aggregate_profiles
+from .regret import RegretTracker
+
+class CommonNoise:
+    def __init__(self, sigma, seed, block=256) -> None:
+        """
+        Reward-noise table indexed by (arm, pull count), shared by all
+        algorithms of a run (common random numbers): the n-th pull of arm a
+        gets the same noise whichever algorithm makes it, so differences in
+        regret between algorithms reflect their choices, not their luck.
+
+        Each arm has its own generator seeded with (*seed, arm) and its column
+        is filled in blocks on first use, so the table only ever holds as many
+        pulls per arm as the most frequent puller made.
+
+        Parameters
+        ----------
+        sigma : float
+            Standard deviation of the reward noise
+        seed : int or sequence of int
+            Seed of the run
+        block : int
+            Minimum number of draws added to an arm's column at a time
+        """
+        self.sigma = sigma
+        self.seed = list(np.atleast_1d(seed))
+        self.block = block
+        self._rngs = {}
+        self._columns = {}
+
+    def value(self, arm: int, n: int) -> float:
+        column = self._columns.get(arm)
+        if column is None or n >= len(column):
+            rng = self._rngs.get(arm)
+            if rng is None:
+                rng = self._rngs[arm] = np.random.default_rng(self.seed + [arm])
+                column = np.empty(0)
+            extra = rng.normal(0.0, self.sigma, size=max(self.block, len(column), n + 1 - len(column)))
+            column = self._columns[arm] = np.concatenate([column, extra])
+        return column[n]
+
+    def cursor(self):
+        """
+        Returns
+        -------
+        callable
+            `arm -> noise` that walks down each arm's column, one per algorithm
+        """
+        pulls = {}
+
+        def draw(arm):
+            n = pulls.get(arm, 0)
+            pulls[arm] = n + 1
+            return self.value(arm, n)
+        return draw
+
+
+class ConvergenceRule:
+    def __init__(self, window=100, delta=0.01) -> None:
+        """
+        Declares a run settled once the policy has chosen the same arm for
+        `window` consecutive steps and that arm's lower confidence bound is
+        above the upper confidence bound of every other arm the policy has
+        pulled. Bounds come from the rewards the runner observed, with radius
+        sigma * sqrt(2 log(1 / delta) / n), so the rule works for any policy.
+        Arms the policy never pulled are taken as abandoned.
+
+        Parameters
+        ----------
+        window : int
+            Required length of the streak on one arm
+        delta : float
+            Confidence parameter of the bounds
+        """
+        self.window = window
+        self.delta = delta
+
+    def converged(self, counts, sums, arm, sigma) -> bool:
+        pulled = counts > 0
+        means = sums[pulled] / counts[pulled]
+        radius = sigma * np.sqrt(2 * np.log(1 / self.delta) / counts[pulled])
+        ucb = means + radius
+        best = np.flatnonzero(pulled) == arm
+        lcb = means[best][0] - radius[best][0]
+        return not np.any(ucb[~best] >= lcb)
+
+
+def run_policy(algo, mu, X, T, sigma, profile=None, noise=None, convergence=None) -> dict:
+    """
+    Step one policy through `T` rounds with Gaussian rewards around `mu`.
+
+    Parameters
+    ----------
+    algo : object
+        An initialised policy
+    mu : np.ndarray
+        True expected reward of each arm (shape: [K])
+    X : np.ndarray
+        Arm positions (shape: [K, D])
+    T : int
+        Horizon
+    sigma : float
+        Standard deviation of the reward noise
+    profile : PolicyProfile, optional
+        If given, RegretTracker updates are timed into it
+    noise : callable, optional
+        `arm -> noise` (e.g. a `CommonNoise.cursor()`); by default rewards are
+        drawn from the global NumPy generator
+    convergence : ConvergenceRule, optional
+        Stop stepping once the rule declares the run settled and fill the
+        remaining steps with the settled arm
+
+    Returns
+    -------
+    dict
+        `arm`, `regret` (instantaneous) and `distance` arrays (shape: [T]),
+        and `converged_at`, the number of steps actually simulated if the
+        run was cut short (else None)
+    """
+    tracker = RegretTracker(mu, X)
+    arms = np.empty(T, dtype=np.int64)
+    converged_at = None
+    if convergence is not None:
+        counts = np.zeros(len(mu))
+        sums = np.zeros(len(mu))
+        streak = 0
+    for t in range(T):
+        a_t = select_index(algo, t)
+        reward = np.random.normal(mu[a_t], sigma) if noise is None else mu[a_t] + noise(a_t)
+        update_policy(algo, a_t, reward, t)
+        if profile is None:
+            tracker.update(a_t)
+        else:
+            start = time.perf_counter()
+            tracker.update(a_t)
+            profile.add_time("tracker.update", time.perf_counter() - start)
+        arms[t] = a_t
+        if convergence is not None:
+            counts[a_t] += 1
+            sums[a_t] += reward
+            streak = streak + 1 if t > 0 and arms[t - 1] == a_t else 1
+            if streak >= convergence.window and convergence.converged(counts, sums, a_t, sigma):
+                converged_at = t + 1
+                break
+    regret = tracker.get_instantaneous_regrets()
+    distance = tracker.get_distances_to_opt()
+    if converged_at is not None and converged_at < T:
+        rest = T - converged_at
+        arms[converged_at:] = arms[converged_at - 1]
+        regret = np.concatenate([regret, np.full(rest, regret[-1])])
+        distance = np.concatenate([distance, np.full(rest, distance[-1])])
+    return {"arm": arms, "regret": regret, "distance": distance, "converged_at": converged_at}
+
+
+class ComparisonResult:
+    def __init__(self, names, n_runs, T) -> None:
+        """
+        Per-step trajectories of several algorithms over repeated runs.
+
+        Parameters
+        ----------
+        names : list of str
+            Algorithm names
+        n_runs : int
+            Number of runs
+        T : int
+            Horizon
+        """
+        self.names = list(names)
+        self.T = T
+        self.arms = {name: np.zeros((n_runs, T), dtype=np.int64) for name in names}
+        self.regrets = {name: np.zeros((n_runs, T)) for name in names}
+        self.distances = {name: np.zeros((n_runs, T)) for name in names}
+        self.converged_at = {name: np.full(n_runs, -1, dtype=np.int64) for name in names}
+        self.profiles = {}
+        self.stopping = {}
+
+    def store(self, name, run, traj) -> None:
+        self.arms[name][run] = traj["arm"]
+        self.regrets[name][run] = traj["regret"]
+        self.distances[name][run] = traj["distance"]
+        if traj.get("converged_at") is not None:
+            self.converged_at[name][run] = traj["converged_at"]
+
+    def cumulative_regret(self, name) -> np.ndarray:
+        """
+        Returns
+        -------
+        np.ndarray
+            Cumulative regret of every run (shape: [R, T])
+        """
+        return np.cumsum(self.regrets[name], axis=1)
+
+    def paired_differences(self, baseline=None, level=0.95, time=None):
+        """
+        Confidence intervals for differences in cumulative regret between
+        algorithms, paired by run. Runs of different algorithms share their
+        ground truth (and, with common random numbers, their reward noise),
+        so the paired interval is usually far narrower than the unpaired one,
+        which is reported alongside for reference.
+
+        Parameters
+        ----------
+        baseline : str, optional
+            Compare every algorithm against this one; default is all pairs
+        level : float
+            Confidence level
+        time : int, optional
+            Timestep (1-based) to compare at; default is the final step
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per pair: mean difference (a - b), its standard error,
+            the t-interval bounds, the unpaired standard error and the number
+            of runs
+        """
+        import pandas as pd
+        from scipy import stats
+
+        col = (time or self.T) - 1
+        final = {name: self.cumulative_regret(name)[:, col] for name in self.names}
+        if baseline is None:
+            pairs = [(a, b) for i, a in enumerate(self.names) for b in self.names[i + 1:]]
+        else:
+            pairs = [(a, baseline) for a in self.names if a != baseline]
+        rows = []
+        for a, b in pairs:
+            # with adaptive run counts only the shared leading runs are paired
+            n = min(len(final[a]), len(final[b]))
+            diff = final[a][:n] - final[b][:n]
+            se = diff.std(ddof=1) / np.sqrt(n)
+            half = stats.t.ppf(0.5 + level / 2, n - 1) * se
+            rows.append({
+                "algorithm_a": a,
+                "algorithm_b": b,
+                "mean_diff": diff.mean(),
+                "se": se,
+                "ci_low": diff.mean() - half,
+                "ci_high": diff.mean() + half,
+                "unpaired_se": np.sqrt(final[a].var(ddof=1) / len(final[a]) + final[b].var(ddof=1) / len(final[b])),
+                "n_runs": n,
+            })
+        return pd.DataFrame(rows)
+
+    def truncation_report(self):
+        """
+        Which runs were cut short by a `ConvergenceRule`.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per truncated run: `algorithm`, `run`, `converged_at`
+            (steps simulated), `settled_arm` and `steps_saved`
+        """
+        import pandas as pd
+
+        rows = []
+        for name in self.names:
+            for run in np.flatnonzero(self.converged_at[name] >= 0):
+                steps = int(self.converged_at[name][run])
+                rows.append({"algorithm": name, "run": int(run), "converged_at": steps,
+                             "settled_arm": int(self.arms[name][run, steps - 1]), "steps_saved": self.T - steps})
+        return pd.DataFrame(rows, columns=["algorithm", "run", "converged_at", "settled_arm", "steps_saved"])
+
+    def save(self, path, chunk_runs=64) -> None:
+        """
+        Write all trajectories to a `TrajectoryWriter` store at `path`.
+        """
+        from .trajectories import TrajectoryWriter
+
+        with TrajectoryWriter(path, self.T, chunk_runs) as writer:
+            for name in self.names:
+                for run in range(len(self.arms[name])):
+                    writer.append(name, run, {"arm": self.arms[name][run], "regret": self.regrets[name][run],
+                                              "distance": self.distances[name][run]})
+
+    def to_frame(self):
+        """
+        Long-format DataFrame with the columns the plotting helpers expect
+        (`time`, `regret` as cumulative regret, `algorithm`, `run`,
+        `distance_to_opt`), all plain scalars.
+        """
+        import pandas as pd
+        frames = []
+        for name in self.names:
+            cum = self.cumulative_regret(name)
+            n_runs, T = cum.shape
+            frames.append(pd.DataFrame({
+                "time": np.tile(np.arange(1, T + 1), n_runs),
+                "regret": cum.ravel(),
+                "algorithm": name,
+                "run": np.repeat(np.arange(n_runs), T),
+                "distance_to_opt": self.distances[name].ravel(),
+            }))
+        return pd.concat(frames, ignore_index=True)
+
+
+def run_comparison(algorithms, n_runs, T, sigma=0.1, ground_truth_kwargs=None, seed=0, profile=False,
+                   common_random_numbers=False, store=None, convergence=None, cache=None) -> ComparisonResult:
+    """
+    Run every algorithm on the same freshly generated ground truth per run.
+
+    Run `r` uses `generate_ground_truth(random_state=r, **ground_truth_kwargs)`,
+    and the global NumPy generator (which the policies draw from) is seeded
+    with (seed, run, algorithm position) before each algorithm starts. So is
+    the noise stream of `f`, which Zoom-In evaluates, so an algorithm's
+    trajectory does not depend on the algorithms run before it.
+
+    Parameters
+    ----------
+    algorithms : dict
+        Mapping from name to a constructor `(f, arms) -> policy`
+    n_runs : int
+        Number of runs
+    T : int
+        Horizon
+    sigma : float
+        Standard deviation of the reward noise
+    ground_truth_kwargs : dict, optional
+        Extra arguments for `generate_ground_truth`
+    seed : int
+        Base seed
+    profile : bool
+        Instrument every policy and collect per-policy profiles, aggregated
+        over runs into `result.profiles`
+    common_random_numbers : bool
+        Share one `CommonNoise` table per run across all algorithms, which
+        makes `result.paired_differences` much tighter for the same runs
+    store : TrajectoryWriter, optional
+        Also append every trajectory to this store as it completes (flushed
+        at the end)
+    convergence : ConvergenceRule, optional
+        Cut settled runs short, see `run_policy`; `result.truncation_report()`
+        lists the truncated runs
+    cache : ResultCache, optional
+        Reuse finished trajectories of `PolicySpec` algorithms from disk and
+        store new ones (ignored when profiling); a run's ground truth is only
+        generated if some trajectory of it is missing
+
+    Returns
+    -------
+    ComparisonResult
+    """
+    from .adapters import PolicySpec
+    from .simulation_setup import generate_ground_truth, reseed_reward_noise
+
+    ground_truth_kwargs = ground_truth_kwargs or {}
+    result = ComparisonResult(algorithms, n_runs, T)
+    summaries = {name: [] for name in algorithms}
+    settings = {"common_random_numbers": common_random_numbers,
+                "convergence": None if convergence is None else [convergence.window, convergence.delta]}
+    for run in range(n_runs):
+        scenario = None
+        table = CommonNoise(sigma, [seed, run]) if common_random_numbers else None
+        for i, (name, constructor) in enumerate(algorithms.items()):
+            key = None
+            if cache is not None and not profile and isinstance(constructor, PolicySpec):
+                key = cache.key(constructor, ground_truth_kwargs, run, [seed, run, i], T, sigma, **settings)
+                traj = cache.get(key)
+                if traj is not None:
+                    result.store(name, run, traj)
+                    if store is not None:
+                        store.append(name, run, traj)
+                    continue
+            if scenario is None:
+                scenario = generate_ground_truth(random_state=run, **ground_truth_kwargs)
+            X, mu, f = scenario
+            reseed_reward_noise(f, [seed, run, i])
+            np.random.seed([seed, run, i])
+            algo = constructor(f, X)
+            prof = None
+            if profile:
+                prof = instrument(algo)
+            noise = table.cursor() if table is not None else None
+            traj = run_policy(algo, mu, X, T, sigma, profile=prof, noise=noise, convergence=convergence)
+            if key is not None:
+                cache.put(key, traj)
+            result.store(name, run, traj)
+            if store is not None:
+                store.append(name, run, traj)
+            if profile:
+                summaries[name].append(prof.summary())
+    if profile:
+        result.profiles = {name: aggregate_profiles(s) for name, s in summaries.items()}
+    if store is not None:
+        store.flush()
+    return result
+
+
+def _ci_width(cum, level, per_timestep) -> float:
+    from scipy import stats
+
+    n = cum.shape[0]
+    if n < 2:
+        return np.inf
+    width = 2 * stats.t.ppf(0.5 + level / 2, n - 1) * cum.std(axis=0, ddof=1) / np.sqrt(n)
+    return float(width.max() if per_timestep else width[-1])
+
+
+def run_adaptive_comparison(algorithms, T, target_width, batch_size=10, min_runs=None, max_runs=200,
+                            level=0.95, per_timestep=False, sigma=0.1, ground_truth_kwargs=None, seed=0,
+                            common_random_numbers=False, store=None, convergence=None, cache=None) -> ComparisonResult:
+    """
+    Like `run_comparison`, but every algorithm keeps receiving batches of runs
+    only until the confidence interval of its average cumulative regret is
+    narrower than `target_width`, or its run budget is spent.
+
+    Run `r` uses the same ground truth and seeding as in `run_comparison`, so
+    the first runs of an adaptive comparison match a fixed one, and algorithms
+    stay paired on the runs they share.
+
+    Parameters
+    ----------
+    algorithms : dict
+        Mapping from name to a constructor `(f, arms) -> policy`
+    T : int
+        Horizon
+    target_width : float
+        Full width of the t-interval at which an algorithm stops
+    batch_size : int
+        Runs added per algorithm between checks
+    min_runs : int, optional
+        Runs before the first check (default: `batch_size`)
+    max_runs : int
+        Run budget per algorithm
+    level : float
+        Confidence level
+    per_timestep : bool
+        Require the interval to be narrow at every timestep, not only at T
+    sigma : float
+        Standard deviation of the reward noise
+    ground_truth_kwargs : dict, optional
+        Extra arguments for `generate_ground_truth`
+    seed : int
+        Base seed
+    common_random_numbers : bool
+        Share one `CommonNoise` table per run across all algorithms
+    store : TrajectoryWriter, optional
+        Also append every trajectory to this store as it completes (flushed
+        at the end)
+    convergence : ConvergenceRule, optional
+        Cut settled runs short, see `run_policy`; `result.truncation_report()`
+        lists the truncated runs
+    cache : ResultCache, optional
+        Reuse finished trajectories of `PolicySpec` algorithms from disk and
+        store new ones, with the same keys as `run_comparison`; a run's
+        ground truth is only generated if some trajectory of it is missing
+
+    Returns
+    -------
+    ComparisonResult
+        Trajectory arrays have one row per run the algorithm used;
+        `result.stopping[name]` holds `runs`, `reason` ("target" or
+        "budget"), the final `ci_width` and the `history` of
+        (runs, ci_width) checks
+    """
+    from .adapters import PolicySpec
+    from .simulation_setup import generate_ground_truth, reseed_reward_noise
+
+    ground_truth_kwargs = ground_truth_kwargs or {}
+    min_runs = min_runs or batch_size
+    settings = {"common_random_numbers": common_random_numbers,
+                "convergence": None if convergence is None else [convergence.window, convergence.delta]}
+    result = ComparisonResult(algorithms, max_runs, T)
+    runs_done = {name: 0 for name in algorithms}
+    history = {name: [] for name in algorithms}
+    active = list(algorithms)
+    run = 0
+    while active:
+        stop = min(max_runs, max(min_runs, run + batch_size))
+        for run in range(run, stop):
+            scenario = None
+            table = CommonNoise(sigma, [seed, run]) if common_random_numbers else None
+            for i, (name, constructor) in enumerate(algorithms.items()):
+                if name not in active:
+                    continue
+                key = traj = None
+                if cache is not None and isinstance(constructor, PolicySpec):
+                    key = cache.key(constructor, ground_truth_kwargs, run, [seed, run, i], T, sigma, **settings)
+                    traj = cache.get(key)
+                if traj is None:
+                    if scenario is None:
+                        scenario = generate_ground_truth(random_state=run, **ground_truth_kwargs)
+                    X, mu, f = scenario
+                    reseed_reward_noise(f, [seed, run, i])
+                    np.random.seed([seed, run, i])
+                    noise = table.cursor() if table is not None else None
+                    traj = run_policy(constructor(f, X), mu, X, T, sigma, noise=noise, convergence=convergence)
+                    if key is not None:
+                        cache.put(key, traj)
+                result.store(name, run, traj)
+                if store is not None:
+                    store.append(name, run, traj)
+                runs_done[name] = run + 1
+        run = stop
+        for name in list(active):
+            width = _ci_width(result.cumulative_regret(name)[:runs_done[name]], level, per_timestep)
+            history[name].append((runs_done[name], width))
+            if width <= target_width or runs_done[name] >= max_runs:
+                active.remove(name)
+                result.stopping[name] = {
+                    "runs": runs_done[name],
+                    "reason": "target" if width <= target_width else "budget",
+                    "ci_width": width,
+                    "history": history[name],
+                }
+    for name in algorithms:
+        n = runs_done[name]
+        result.arms[name] = result.arms[name][:n]
+        result.regrets[name] = result.regrets[name][:n]
+        result.distances[name] = result.distances[name][:n]
+        result.converged_at[name] = result.converged_at[name][:n]
+    if store is not None:
+        store.flush()
+    return result
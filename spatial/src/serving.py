@@ -0,0 +1,228 @@
+import asyncio
+import collections
+import queue
+import threading
+import time
+import numpy as np
+
+from .adapters import select_indices, update_policy
+
+class PolicyServer:
+    def __init__(self, policy, max_batch=1024, max_wait=0.005, prefetch=128) -> None:
+        """
+        Concurrency-safe serving wrapper around a single policy.
+
+        Only the background thread ever touches the policy. Reports are queued
+        and applied in micro-batches of up to `max_batch`; after every batch
+        (and whenever the buffer runs low) the thread precomputes the next
+        selections from the refreshed posterior: `prefetch` of them for
+        Thompson-sampling policies, a single one for policies whose choice is
+        deterministic given their state (see `select_indices`). `select`
+        never waits for the thread: it pops from that buffer and, once it is
+        exhausted, repeats the latest buffer until the next refresh. How far
+        the served posterior lags behind is reported by `stats` as staleness,
+        the number of reports received but not yet applied when a selection
+        was computed.
+
+        An exception in the background thread stops the server and is raised
+        again from the next `select`, `report` or `stop`.
+
+        Parameters
+        ----------
+        policy : object
+            Any policy from this package
+        max_batch : int
+            Maximum number of reports applied per refresh
+        max_wait : float
+            Seconds the background thread waits for more reports before
+            refreshing with a partial batch
+        prefetch : int
+            Maximum number of selections computed per refresh
+        """
+        self.policy = policy
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.prefetch = prefetch
+        self.t = 0
+        self.n_batches = 0
+        self.n_batched_reports = 0
+        self.n_reports = 0
+        self.n_stale = 0
+        self.n_selections = 0
+        self.staleness_sum = 0
+        self.staleness_max = 0
+        self._computed_at = 0
+        self._error = None
+        self._reports = queue.SimpleQueue()
+        self._selections = collections.deque()
+        self._fallback = [0]
+        self._running = threading.Event()
+        self._low = threading.Event()
+        self._ready = threading.Event()
+        self._thread = None
+
+    async def start(self) -> "PolicyServer":
+        if self._thread is None:
+            self._running.set()
+            self._thread = threading.Thread(target=self._worker, name="policy-refresh", daemon=True)
+            self._thread.start()
+            await asyncio.get_running_loop().run_in_executor(None, self._ready.wait)
+        self._raise_if_failed()
+        return self
+
+    async def stop(self) -> None:
+        if self._thread is not None:
+            self._running.clear()
+            self._low.set()
+            await asyncio.get_running_loop().run_in_executor(None, self._thread.join)
+            self._thread = None
+        self._raise_if_failed()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("PolicyServer background thread failed") from self._error
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    async def select(self) -> int:
+        """
+        Returns
+        -------
+        int
+            Index of the arm to serve. If the prefetched buffer is exhausted
+            before the next refresh, the latest buffer is cycled through
+            again (counted in `n_stale`).
+        """
+        self._raise_if_failed()
+        fallback = self._fallback
+        try:
+            arm = self._selections.popleft()
+        except IndexError:
+            arm = fallback[self.n_stale % len(fallback)]
+            self.n_stale += 1
+        if len(self._selections) < self.prefetch // 2:
+            self._low.set()
+        staleness = self.n_reports - self._computed_at
+        self.n_selections += 1
+        self.staleness_sum += staleness
+        self.staleness_max = max(self.staleness_max, staleness)
+        return arm
+
+    async def report(self, arm: int, reward: float) -> None:
+        """
+        Queue the reward of a served arm for the next micro-batch.
+        """
+        self._raise_if_failed()
+        self._reports.put((int(arm), float(reward)))
+        self.n_reports += 1
+
+    def _drain(self) -> list:
+        batch = []
+        try:
+            batch.append(self._reports.get(timeout=self.max_wait))
+            while len(batch) < self.max_batch:
+                batch.append(self._reports.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _refill(self) -> None:
+        computed_at = self.t
+        arms = select_indices(self.policy, self.prefetch, self.t)
+        self._fallback = arms
+        self._computed_at = computed_at
+        self._low.clear()
+        self._selections = collections.deque(arms)
+
+    def _worker(self) -> None:
+        try:
+            self._refill()
+            self._ready.set()
+            while self._running.is_set():
+                batch = self._drain()
+                for arm, reward in batch:
+                    update_policy(self.policy, arm, reward, self.t)
+                    self.t += 1
+                if batch:
+                    self.n_batches += 1
+                    self.n_batched_reports += len(batch)
+                if batch or self._low.is_set():
+                    self._refill()
+            # apply whatever was reported before shutdown
+            while not self._reports.empty():
+                arm, reward = self._reports.get_nowait()
+                update_policy(self.policy, arm, reward, self.t)
+                self.t += 1
+        except BaseException as e:
+            self._error = e
+            self._running.clear()
+            self._ready.set()
+
+    def stats(self) -> dict:
+        """
+        Returns
+        -------
+        dict
+            Number of reports, applied micro-batches, mean batch size,
+            selections repeated from an exhausted buffer, and the mean and
+            maximum staleness of the served selections in reports
+        """
+        return {
+            "reports": self.n_reports,
+            "batches": self.n_batches,
+            "mean_batch_size": self.n_batched_reports / self.n_batches if self.n_batches else 0.0,
+            "stale_selections": self.n_stale,
+            "mean_staleness": self.staleness_sum / self.n_selections if self.n_selections else 0.0,
+            "max_staleness": self.staleness_max,
+        }
+
+
+async def run_load_test(server, reward_fn, n_clients=32, requests_per_client=200, think_time=0.0) -> dict:
+    """
+    Local load generator: `n_clients` concurrent clients each repeatedly
+    select an arm, draw its reward and report it back.
+
+    Parameters
+    ----------
+    server : PolicyServer
+        A started server
+    reward_fn : callable
+        Maps an arm index to a sampled reward
+    n_clients : int
+        Number of concurrent clients
+    requests_per_client : int
+        Number of select/report round trips per client
+    think_time : float
+        Seconds each client sleeps between select and report
+
+    Returns
+    -------
+    dict
+        p50/p99/max select latency in milliseconds and overall throughput
+    """
+    latencies = []
+
+    async def client():
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            arm = await server.select()
+            latencies.append(time.perf_counter() - start)
+            await asyncio.sleep(think_time)
+            await server.report(arm, reward_fn(arm))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(n_clients)))
+    elapsed = time.perf_counter() - start
+    lat_ms = np.array(latencies) * 1e3
+    return {
+        "requests": len(latencies),
+        "p50_ms": float(np.percentile(lat_ms, 50)),
+        "p99_ms": float(np.percentile(lat_ms, 99)),
+        "max_ms": float(lat_ms.max()),
+        "throughput_rps": len(latencies) / elapsed,
+        **server.stats(),
+    }
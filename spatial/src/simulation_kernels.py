@@ -0,0 +1,252 @@
+import numpy as np
+
+from .adapters import PolicySpec, _ZOOMING_POLICIES
+
+# Whole-horizon kernels for the standard policies. Each kernel is a loop over
+# timesteps with the same arithmetic as the policy's select_arm/update, scoring
+# all arms with array expressions, compiled with numba when it is installed
+# (and run as ordinary Python, still vectorised over the arms, otherwise). The
+# Gaussian draws are taken in blocks from a legacy RandomState in exactly the
+# order the step-by-step API consumes them, so `simulate` reproduces
+# `np.random.seed(seed); run_policy(...)` bit for bit. The one exception is
+# compiled BernoulliTS: legacy Beta draws consume a data-dependent number of
+# uniforms, so its kernel draws them from numba's own generator instead
+# (seeded from `seed`, hence still reproducible, but not equal to run_policy).
+
+try:
+    import numba
+    from numba import njit
+    HAVE_NUMBA = not numba.config.DISABLE_JIT
+except ImportError:
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+_BLOCK_DRAWS = 1 << 20
+
+@njit(cache=True)
+def _gaussian_ucb0_kernel(counts, values, means, sigma, noise, t0, arms):
+    # the score is so cheap that allocating temporaries would dominate, so it
+    # is computed in place, with counts + 1e-8 kept up to date per pull
+    K = counts.shape[0]
+    denom = counts + 1e-8
+    score = np.empty(K)
+    for i in range(noise.shape[0]):
+        t = t0 + i
+        if t < K:
+            a = t
+        else:
+            np.divide(2 * np.log(t), denom, score)
+            np.sqrt(score, score)
+            np.add(values, score, score)
+            a = np.argmax(score)
+        reward = means[a] + sigma * noise[i]
+        counts[a] += 1
+        denom[a] = counts[a] + 1e-8
+        values[a] += (reward - values[a]) / counts[a]
+        arms[i] = a
+
+@njit(cache=True)
+def _gaussian_ucb1_kernel(counts, mean_est, squared_sums, means, sigma, noise, t0, arms):
+    K = counts.shape[0]
+    for i in range(noise.shape[0]):
+        t = t0 + i
+        if t < K:
+            a = t
+        else:
+            # every count is positive once the warm-up is over
+            log_t = np.log(t)
+            variance = squared_sums / counts - mean_est * mean_est
+            term = np.minimum(0.25, variance + np.sqrt(2 * log_t / counts))
+            a = np.argmax(mean_est + np.sqrt((log_t / counts) * term))
+        reward = means[a] + sigma * noise[i]
+        counts[a] += 1
+        mean_est[a] += (reward - mean_est[a]) / counts[a]
+        squared_sums[a] += reward * reward
+        arms[i] = a
+
+@njit(cache=True)
+def _gaussian_ucb_kernel(counts, mean_est, squared_sums, means, sigma, noise, t0, arms):
+    K = counts.shape[0]
+    for i in range(noise.shape[0]):
+        t = t0 + i
+        if t < K:
+            a = t
+        else:
+            log_t = np.log(t)
+            var_hat = np.where(counts > 1, squared_sums / counts - mean_est * mean_est, 0.0)
+            n = counts + 1e-8
+            a = np.argmax(mean_est + np.sqrt((log_t / n) * np.minimum(0.25, var_hat + np.sqrt(2 * log_t / n))))
+        reward = means[a] + sigma * noise[i]
+        n_a = counts[a]
+        counts[a] += 1
+        mean_est[a] += (reward - mean_est[a]) / (n_a + 1)
+        squared_sums[a] += reward * reward
+        arms[i] = a
+
+@njit(cache=True)
+def _bernoulli_ucb_kernel(counts, successes, means, sigma, noise, t0, arms):
+    K = counts.shape[0]
+    for i in range(noise.shape[0]):
+        t = t0 + i
+        if t < K:
+            a = t
+        else:
+            log_t = np.log(t)
+            mu = successes / counts
+            var_hat = mu * (1 - mu)
+            a = np.argmax(mu + np.sqrt((log_t / counts) * np.minimum(0.25, var_hat + np.sqrt(2 * log_t / counts))))
+        reward = means[a] + sigma * noise[i]
+        counts[a] += 1
+        successes[a] += reward
+        arms[i] = a
+
+@njit(cache=True)
+def _gaussian_ts_kernel(prior_means, prior_vars, counts, sum_rewards, obs_var, means, sigma, noise, arms):
+    # noise rows hold the K posterior draws followed by the reward draw
+    K = prior_means.shape[0]
+    for i in range(noise.shape[0]):
+        a = np.argmax(prior_means + np.sqrt(prior_vars) * noise[i, :K])
+        reward = means[a] + sigma * noise[i, K]
+        post_var = 1 / (1 / prior_vars[a] + 1 / obs_var)
+        post_mean = post_var * (prior_means[a] / prior_vars[a] + reward / obs_var)
+        counts[a] += 1
+        sum_rewards[a] += reward
+        prior_means[a] = post_mean
+        prior_vars[a] = post_var
+        arms[i] = a
+
+@njit(cache=True)
+def _seed_kernel_rng(seed):
+    # inside compiled code this seeds numba's generator, not NumPy's
+    np.random.seed(seed)
+
+@njit(cache=True)
+def _bernoulli_ts_kernel(successes, failures, means, sigma, noise, t0, arms):
+    K = successes.shape[0]
+    draws = np.empty(K)
+    for i in range(noise.shape[0]):
+        for k in range(K):
+            draws[k] = np.random.beta(successes[k] + 1, failures[k] + 1)
+        a = np.argmax(draws)
+        if means[a] + sigma * noise[i] > 0:
+            successes[a] += 1
+        else:
+            failures[a] += 1
+        arms[i] = a
+
+def _run_blocks(kernel, state, means, sigma, T, rs, arms, per_step):
+    block = max(1, _BLOCK_DRAWS // per_step)
+    for t0 in range(0, T, block):
+        n = min(block, T - t0)
+        if per_step == 1:
+            noise = rs.standard_normal(n)
+            kernel(*state, means, sigma, noise, t0, arms[t0:t0 + n])
+        else:
+            noise = rs.standard_normal((n, per_step))
+            kernel(*state, means, sigma, noise, arms[t0:t0 + n])
+
+def _simulate_bernoulli_ts(K, means, sigma, T, rs, arms):
+    # exact replay of the step-by-step run, used without numba
+    successes = np.zeros(K)
+    failures = np.zeros(K)
+    for t in range(T):
+        a = np.argmax(rs.beta(successes + 1, failures + 1))
+        if rs.normal(means[a], sigma) > 0:
+            successes[a] += 1
+        else:
+            failures[a] += 1
+        arms[t] = a
+
+def simulate(policy_spec, means, T, seed=None, sigma=0.1, X=None, f=None) -> dict:
+    """
+    Run one policy over the whole horizon in a single compiled loop.
+
+    The result equals `np.random.seed(seed)` followed by
+    `run_policy(policy_spec(f, X), means, X, T, sigma)`, without touching
+    the global NumPy generator. Policies without a kernel (KL-UCB, GP and
+    Zoom-In policies) fall back to exactly that step-by-step run, after which
+    the state of the global generator is restored. With numba, BernoulliTS
+    draws its Beta samples from numba's generator instead, seeded from
+    `seed`: the run is reproducible and statistically equivalent, but not
+    equal to the step-by-step one.
+
+    Parameters
+    ----------
+    policy_spec : PolicySpec or str
+        Policy and its parameters
+    means : np.ndarray
+        True expected reward of each arm (shape: [K])
+    T : int
+        Horizon
+    seed : int or sequence of int, optional
+        Seed of the legacy NumPy generator the policy and rewards draw from
+    sigma : float
+        Standard deviation of the reward noise
+    X : np.ndarray, optional
+        Arm positions (shape: [K, D]); needed for `distance` and by the
+        fallback for GP and Zoom-In policies
+    f : callable, optional
+        Reward function of the scenario, needed by Zoom-In policies; a
+        generated one has its noise stream reseeded with `seed`, as in
+        `run_comparison`
+
+    Returns
+    -------
+    dict
+        `arm` and `regret` (instantaneous) arrays (shape: [T]), plus
+        `distance` when `X` is given
+    """
+    if not isinstance(policy_spec, PolicySpec):
+        policy_spec = PolicySpec(policy_spec)
+    if policy_spec.policy in _ZOOMING_POLICIES and (f is None or X is None):
+        raise ValueError("Zoom-In policies need the reward function f and the arm positions X")
+    means = np.ascontiguousarray(np.ravel(means), dtype=float)
+    K = len(means)
+    name, params = policy_spec.policy, policy_spec.params
+    rs = np.random.RandomState(seed)
+    arms = np.empty(T, dtype=np.int64)
+
+    if name == "GaussianUCB0" and not params:
+        _run_blocks(_gaussian_ucb0_kernel, (np.zeros(K), np.zeros(K)), means, sigma, T, rs, arms, 1)
+    elif name == "GaussianUCB1" and not params:
+        _run_blocks(_gaussian_ucb1_kernel, (np.zeros(K), np.zeros(K), np.zeros(K)), means, sigma, T, rs, arms, 1)
+    elif name == "GaussianUCB" and not params:
+        _run_blocks(_gaussian_ucb_kernel, (np.zeros(K), np.zeros(K), np.zeros(K)), means, sigma, T, rs, arms, 1)
+    elif name == "BernoulliUCB" and not params:
+        _run_blocks(_bernoulli_ucb_kernel, (np.zeros(K), np.zeros(K)), means, sigma, T, rs, arms, 1)
+    elif name == "GaussianTS":
+        p = {"prior_mean": 0.0, "prior_var": 1.0, "obs_var": 1.0, **params}
+        state = (np.full(K, float(p["prior_mean"])), np.full(K, float(p["prior_var"])),
+                 np.zeros(K), np.zeros(K), float(p["obs_var"]))
+        _run_blocks(_gaussian_ts_kernel, state, means, sigma, T, rs, arms, K + 1)
+    elif name == "BernoulliTS" and not params and HAVE_NUMBA:
+        _seed_kernel_rng(rs.randint(2**31))
+        _run_blocks(_bernoulli_ts_kernel, (np.zeros(K), np.zeros(K)), means, sigma, T, rs, arms, 1)
+    elif name == "BernoulliTS" and not params:
+        _simulate_bernoulli_ts(K, means, sigma, T, rs, arms)
+    else:
+        from .runner import run_policy
+        from .simulation_setup import reseed_reward_noise
+
+        positions = np.zeros((K, 1)) if X is None else X
+        if f is not None:
+            reseed_reward_noise(f, seed)
+        global_state = np.random.get_state()
+        try:
+            np.random.seed(seed)
+            traj = run_policy(policy_spec(f, positions), means, positions, T, sigma)
+        finally:
+            np.random.set_state(global_state)
+        if X is None:
+            del traj["distance"]
+        return traj
+
+    out = {"arm": arms, "regret": np.max(means) - means[arms]}
+    if X is not None:
+        X = np.asarray(X)
+        out["distance"] = np.linalg.norm(X[arms] - X[np.argmax(means)], axis=1)
+    return out
@@ -26,6 +26,81 @@ class BernoulliUCB:
         self.counts[arm] += 1
         self.successes[arm] += reward
 
+def bernoulli_kl(p, q, eps=1e-15):
+    p = np.clip(p, eps, 1 - eps)
+    q = np.clip(q, eps, 1 - eps)
+    return p * np.log(p / q) + (1 - p) * np.log((1 - p) / (1 - q))
+
+def kl_ucb_indices(means, counts, threshold, tol=1e-6, max_iter=50):
+    """
+    Upper confidence indices max{q >= mean : n * kl(mean, q) <= threshold}
+    for all arms at once.
+
+    Every arm keeps a bracket [lo, hi] around its root. hi starts at the
+    tighter of the Pinsker bound and the bound obtained by dropping the
+    -p log q term of the divergence (exact for p = 0). Each step moves hi down
+    with a Newton step, which never overshoots because the KL divergence is
+    convex and increasing in q, and then probes just below the new hi (or at
+    the bracket midpoint, whichever is higher) to tighten lo.
+
+    Parameters
+    ----------
+    means : np.ndarray
+        Empirical means in [0, 1] (shape: [K])
+    counts : np.ndarray
+        Number of pulls per arm (shape: [K]), all positive
+    threshold : float
+        Exploration level, e.g. log(t)
+    tol : float
+        Stop once every bracket is narrower than this
+    max_iter : int
+        Hard cap on the number of steps
+
+    Returns
+    -------
+    np.ndarray
+        KL-UCB index of every arm (shape: [K])
+    """
+    eps = 1e-12
+    means = np.asarray(means, dtype=float)
+    budget = threshold / counts
+    lo = means.copy()
+    p = np.clip(means, eps, 1 - eps)
+    tail = (1 - p) * np.exp(-(budget - p * np.log(p)) / (1 - p))
+    hi = np.clip(np.minimum(means + np.sqrt(budget / 2), 1 - tail), lo, 1 - eps)
+    for _ in range(max_iter):
+        gap = bernoulli_kl(means, hi) - budget
+        newton = hi - gap * hi * (1 - hi) / np.maximum(hi - means, eps)
+        hi = np.where(gap > 0, np.maximum(newton, lo), hi)
+        if np.max(hi - lo) <= tol:
+            break
+        probe = np.maximum(hi - 0.5 * tol, 0.5 * (lo + hi))
+        too_far = bernoulli_kl(means, probe) > budget
+        lo = np.where(too_far, lo, probe)
+        hi = np.where(too_far, probe, hi)
+    return hi
+
+class BernoulliKLUCB:
+    def __init__(self, K, c=0.0, tol=1e-6, max_iter=50):
+        self.K = K
+        self.c = c
+        self.tol = tol
+        self.max_iter = max_iter
+        self.counts = np.zeros(K)
+        self.successes = np.zeros(K)
+
+    def select_arm(self, t):
+        if t < self.K:
+            return t
+        threshold = np.log(t) + self.c * np.log(max(np.log(t), 1.0))
+        means = self.successes / self.counts
+        indices = kl_ucb_indices(means, self.counts, threshold, tol=self.tol, max_iter=self.max_iter)
+        return np.argmax(indices)
+
+    def update(self, arm, reward):
+        self.counts[arm] += 1
+        self.successes[arm] += reward
+
 class BernoulliTS:
     def __init__(self, K):
         self.K = K
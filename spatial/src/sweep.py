@@ -0,0 +1,186 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .adapters import PolicySpec
+from .runner import run_policy
+from .simulation_setup import generate_ground_truth, reseed_reward_noise
+
+def _expand_grid(space) -> list:
+    keys = list(space)
+    return [dict(zip(keys, values)) for values in itertools.product(*(space[k] for k in keys))]
+
+def _sample(space, n_samples, rng) -> list:
+    # lists are sampled uniformly, scipy.stats distributions via .rvs and
+    # any other callable is called with the generator
+    def draw(values):
+        if hasattr(values, "rvs"):
+            return values.rvs(random_state=rng).item()
+        if callable(values):
+            return values(rng)
+        return values[rng.integers(len(values))]
+    return [{k: draw(v) for k, v in space.items()} for _ in range(n_samples)]
+
+def _build_scenario(gt_kwargs, seed) -> tuple:
+    """
+    Worker task: build one ground-truth scenario.
+    """
+    start = time.perf_counter()
+    scenario = generate_ground_truth(random_state=seed, **gt_kwargs)
+    return scenario, time.perf_counter() - start
+
+def _run_scenario(scenario, setup_s, seed, configs, T, sigma, convergence=None) -> list:
+    """
+    Worker task: run policy configurations on one prebuilt scenario.
+    """
+    X, mu, f = scenario
+    rows = []
+    for config_id, spec in configs:
+        # a noise stream per configuration, so results do not depend on
+        # which configurations share this task
+        reseed_reward_noise(f, [seed, config_id])
+        np.random.seed([seed, config_id])
+        start = time.perf_counter()
+        traj = run_policy(spec(f, X), mu, X, T, sigma, convergence=convergence)
+        rows.append({
+            "config_id": config_id,
+            "seed": seed,
+            "horizon": T,
+            "final_regret": float(traj["regret"].sum()),
+            "final_distance": float(traj["distance"][-1]),
+            "runtime_s": time.perf_counter() - start,
+            "scenario_setup_s": setup_s,
+            "converged_at": traj["converged_at"],
+        })
+    return rows
+
+def run_sweep(policy, space, ground_truth_space=None, ground_truth_kwargs=None, n_seeds=5, T=200,
+              sigma=0.1, n_samples=None, halving_rungs=1, eta=3, n_jobs=None, seed=0, convergence=None):
+    """
+    Evaluate many configurations of one policy across seeds on a process pool.
+
+    Every (ground-truth configuration, seed) scenario is generated once, in
+    one worker, and sent to every task that evaluates policy configurations
+    on it, at every rung; only when there are fewer scenarios than workers
+    are the configurations split into several tasks per scenario. Each
+    configuration draws the noise of `f` from its own stream, seeded by
+    (seed, configuration id), so results do not depend on `n_jobs`.
+
+    With `halving_rungs > 1`, successive halving is applied on the horizon:
+    all configurations run at T / eta**(rungs-1), only the best 1/eta (by
+    mean final regret over all scenarios) advance to the next, eta times
+    longer horizon, up to T.
+
+    Parameters
+    ----------
+    policy : str or type
+        Policy class or name, see `PolicySpec`
+    space : dict
+        Policy parameters: name -> list of values (grid search), or with
+        `n_samples`, lists, scipy.stats distributions or callables `rng -> value`
+    ground_truth_space : dict, optional
+        Scenario parameters swept like `space` (always as a grid), e.g.
+        `{"length_scale": [0.2, 1.0]}`
+    ground_truth_kwargs : dict, optional
+        Fixed arguments for `generate_ground_truth`
+    n_seeds : int
+        Number of scenarios (seeds 0..n_seeds-1) per ground-truth configuration
+    T : int
+        Final horizon
+    sigma : float
+        Standard deviation of the reward noise
+    n_samples : int, optional
+        Random search with this many configurations instead of a grid
+    halving_rungs : int
+        Number of successive-halving rungs (1 disables halving)
+    eta : int
+        Halving rate
+    n_jobs : int, optional
+        Worker processes (default: all cores); 1 runs in-process
+    seed : int
+        Seed of the random search
+    convergence : ConvergenceRule, optional
+        Cut settled runs short; `converged_at` records where (NaN if not)
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per (configuration, scenario, rung) with the policy
+        parameters and the scenario parameters (prefixed `gt_`) as columns,
+        plus `final_regret`, `final_distance`, `runtime_s`,
+        `scenario_setup_s`, `horizon`, `converged_at` and `rung`
+    """
+    import pandas as pd
+
+    ground_truth_kwargs = ground_truth_kwargs or {}
+    configs = _sample(space, n_samples, np.random.default_rng(seed)) if n_samples else _expand_grid(space)
+    specs = {i: PolicySpec(policy, **params) for i, params in enumerate(configs)}
+    scenarios = _expand_grid(ground_truth_space or {})
+    n_jobs = n_jobs or os.cpu_count()
+
+    frames = []
+    alive = list(specs)
+    pool = ProcessPoolExecutor(max_workers=n_jobs) if n_jobs > 1 else None
+    try:
+        keys = [(sid, s) for sid in range(len(scenarios)) for s in range(n_seeds)]
+        build_args = [({**ground_truth_kwargs, **scenarios[sid]}, s) for sid, s in keys]
+        if pool is None:
+            built = [_build_scenario(*a) for a in build_args]
+        else:
+            built = list(pool.map(_build_scenario, *zip(*build_args)))
+        built = dict(zip(keys, built))
+        for rung in range(halving_rungs):
+            horizon = max(1, int(T / eta ** (halving_rungs - 1 - rung)))
+            n_groups = min(len(alive), -(-n_jobs // len(keys)))
+            groups = [alive[g::n_groups] for g in range(n_groups)]
+            tasks = [key for key in keys for _ in groups]
+            args = [(*built[key], key[1], [(i, specs[i]) for i in group], horizon, sigma, convergence)
+                    for key in keys for group in groups]
+            if pool is None:
+                outputs = [_run_scenario(*a) for a in args]
+            else:
+                outputs = list(pool.map(_run_scenario, *zip(*args)))
+            rows = []
+            for (sid, _), out in zip(tasks, outputs):
+                for row in out:
+                    gt_params = {f"gt_{k}": v for k, v in scenarios[sid].items()}
+                    rows.append({**configs[row["config_id"]], **gt_params, "scenario_id": sid, "rung": rung, **row})
+            frame = pd.DataFrame(rows)
+            frames.append(frame)
+            if rung < halving_rungs - 1:
+                ranking = frame.groupby("config_id")["final_regret"].mean().sort_values()
+                alive = list(ranking.index[:max(1, len(alive) // eta)])
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    df = pd.concat(frames, ignore_index=True)
+    df.attrs["policy_params"] = list(space)
+    df.attrs["scenario_params"] = [f"gt_{k}" for k in (ground_truth_space or {})]
+    return df
+
+def summarize_sweep(df, by=None):
+    """
+    Mean and standard error of the final regret per configuration, at the
+    longest horizon each configuration reached, best first.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Output of `run_sweep`
+    by : list of str, optional
+        Extra grouping columns, e.g. scenario parameters
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    last = df[df["rung"] == df.groupby("config_id")["rung"].transform("max")]
+    keys = ["config_id", "rung", "horizon"] + list(by or [])
+    out = last.groupby(keys)["final_regret"].agg(["mean", "std", "count"]).reset_index()
+    out["se"] = out["std"] / np.sqrt(out["count"])
+    params = df.drop_duplicates("config_id")[["config_id"] + df.attrs.get("policy_params", [])]
+    out = out.merge(params, on="config_id")
+    return out.sort_values(["rung", "mean"], ascending=[False, True]).reset_index(drop=True)
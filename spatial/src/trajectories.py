@@ -0,0 +1,189 @@
+import json
+import os
+import numpy as np
+
+# A trajectory store is a directory with `meta.json` (horizon, algorithms and
+# their chunks) and, per algorithm, chunk directories holding one `.npy` file
+# per column, each of shape [runs in chunk, T]. Columns are typed (int32 arm
+# indices, float64 regret and distance), so loading never needs the
+# `ensure_scalar` cleanup, and every chunk can be memory-mapped.
+
+FORMAT_VERSION = 1
+
+COLUMNS = {"arm": np.int32, "regret": np.float64, "distance": np.float64}
+
+def _write_meta(path, meta) -> None:
+    tmp = os.path.join(path, "meta.json.tmp")
+    with open(tmp, "w") as fh:
+        json.dump(meta, fh)
+    os.replace(tmp, os.path.join(path, "meta.json"))
+
+class TrajectoryWriter:
+    def __init__(self, path, T, chunk_runs=64) -> None:
+        """
+        Append per-run trajectories to a store, buffering `chunk_runs` runs
+        per algorithm before writing a chunk. Opening an existing store with
+        the same horizon appends to it.
+
+        Parameters
+        ----------
+        path : str
+            Store directory (created if missing)
+        T : int
+            Horizon; every trajectory must have this length
+        chunk_runs : int
+            Runs per chunk
+        """
+        self.path = path
+        self.T = T
+        self.chunk_runs = chunk_runs
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            with open(meta_path) as fh:
+                self.meta = json.load(fh)
+            if self.meta["T"] != T:
+                raise ValueError(f"Store at {path} has horizon {self.meta['T']}, not {T}")
+        else:
+            self.meta = {"format_version": FORMAT_VERSION, "T": T,
+                         "columns": {k: np.dtype(v).str for k, v in COLUMNS.items()}, "algorithms": {}}
+        self._buffers = {}
+
+    def append(self, name, run, traj) -> None:
+        """
+        Parameters
+        ----------
+        name : str
+            Algorithm name
+        run : int
+            Run index
+        traj : dict
+            `arm`, `regret` (instantaneous) and `distance` arrays, as returned
+            by `run_policy`
+        """
+        buf = self._buffers.setdefault(name, {"run": [], **{k: [] for k in COLUMNS}})
+        buf["run"].append(run)
+        for k, dtype in COLUMNS.items():
+            values = np.asarray(traj[k], dtype=dtype).ravel()
+            if len(values) != self.T:
+                raise ValueError(f"Column {k} has length {len(values)}, expected {self.T}")
+            buf[k].append(values)
+        if len(buf["run"]) >= self.chunk_runs:
+            self._flush(name)
+
+    def _flush(self, name) -> None:
+        buf = self._buffers.pop(name, None)
+        if not buf or not buf["run"]:
+            return
+        algos = self.meta["algorithms"]
+        entry = algos.setdefault(name, {"dir": f"algo_{len(algos):04d}", "chunks": []})
+        chunk = f"chunk_{len(entry['chunks']):06d}"
+        chunk_dir = os.path.join(self.path, entry["dir"], chunk)
+        os.makedirs(chunk_dir, exist_ok=True)
+        np.save(os.path.join(chunk_dir, "run.npy"), np.asarray(buf["run"], dtype=np.int64))
+        for k in COLUMNS:
+            np.save(os.path.join(chunk_dir, f"{k}.npy"), np.stack(buf[k]))
+        entry["chunks"].append({"name": chunk, "runs": len(buf["run"])})
+        # the chunk only becomes visible once meta.json lists it
+        _write_meta(self.path, self.meta)
+
+    def flush(self) -> None:
+        for name in list(self._buffers):
+            self._flush(name)
+        if not os.path.exists(os.path.join(self.path, "meta.json")):
+            _write_meta(self.path, self.meta)
+
+    close = flush
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.flush()
+
+class TrajectoryStore:
+    def __init__(self, path) -> None:
+        """
+        Read-only view of a store written by `TrajectoryWriter`. Nothing is
+        read until a column is requested, and then only the chunks and the
+        time range asked for are touched, through memory maps.
+
+        Parameters
+        ----------
+        path : str
+            Store directory
+        """
+        self.path = path
+        with open(os.path.join(path, "meta.json")) as fh:
+            self.meta = json.load(fh)
+        if self.meta["format_version"] > FORMAT_VERSION:
+            raise ValueError(f"Store format {self.meta['format_version']} is newer than supported ({FORMAT_VERSION})")
+        self.T = self.meta["T"]
+
+    @property
+    def algorithms(self) -> list:
+        return list(self.meta["algorithms"])
+
+    def n_runs(self, name) -> int:
+        return sum(c["runs"] for c in self.meta["algorithms"][name]["chunks"])
+
+    def _chunk_arrays(self, name, column):
+        entry = self.meta["algorithms"][name]
+        for chunk in entry["chunks"]:
+            yield np.load(os.path.join(self.path, entry["dir"], chunk["name"], f"{column}.npy"), mmap_mode="r")
+
+    def load(self, name, column, start=0, stop=None, step=1) -> np.ndarray:
+        """
+        Parameters
+        ----------
+        name : str
+            Algorithm name
+        column : str
+            `arm`, `regret` (instantaneous), `distance` or `run`
+        start, stop, step : int
+            Time range (0-based, like a slice); ignored for `run`
+
+        Returns
+        -------
+        np.ndarray
+            Shape [R, len(range)] (or [R] for `run`), rows in write order
+        """
+        if column == "run":
+            return np.concatenate(list(self._chunk_arrays(name, "run")))
+        window = slice(start, stop, step)
+        return np.concatenate([chunk[:, window] for chunk in self._chunk_arrays(name, column)])
+
+    def cumulative_regret(self, name, start=0, stop=None, step=1) -> np.ndarray:
+        """
+        Cumulative regret over a time range; only the prefix up to `stop` is
+        read.
+
+        Returns
+        -------
+        np.ndarray
+            Shape [R, len(range)]
+        """
+        stop = self.T if stop is None else stop
+        return np.cumsum(self.load(name, "regret", 0, stop), axis=1)[:, start::step]
+
+    def to_frame(self, algorithms=None, start=0, stop=None, step=1):
+        """
+        Long-format DataFrame with the columns the plotting helpers expect
+        (`time`, `regret` as cumulative regret, `algorithm`, `run`,
+        `distance_to_opt`), for the selected algorithms and time range.
+        """
+        import pandas as pd
+
+        times = np.arange(self.T)[start:stop:step]
+        frames = []
+        for name in algorithms or self.algorithms:
+            cum = self.cumulative_regret(name, start, stop, step)
+            runs = self.load(name, "run")
+            frames.append(pd.DataFrame({
+                "time": np.tile(times + 1, len(runs)),
+                "regret": cum.ravel(),
+                "algorithm": name,
+                "run": np.repeat(runs, len(times)),
+                "distance_to_opt": self.load(name, "distance", start, stop, step).ravel(),
+            }))
+        return pd.concat(frames, ignore_index=True)
@@ -12,7 +12,8 @@ class CustomObjective:
     def __call__(self, x):
         return self.evaluate(x)  # allows object to be used like a function
 
-def get_zoomin_algorithm(f, arms, domain, rounds, nu, rho, scoring_method="ucb", reward_type=None, min_pulls_before_zoom=5):
+def get_zoomin_algorithm(f, arms, domain, rounds, nu, rho, scoring_method="ucb", reward_type=None, min_pulls_before_zoom=5,
+                          prune=False, prune_every=50, prune_sigma=None):
     return DiscreteZoomingWrapper(
         f=CustomObjective(f),
         arms=arms,
@@ -21,6 +22,9 @@ def get_zoomin_algorithm(f, arms, domain, rounds, nu, rho, scoring_method="ucb",
         domain=domain,
         scoring_method=scoring_method,
         reward_type=reward_type,
-        min_pulls_before_zoom=min_pulls_before_zoom
+        min_pulls_before_zoom=min_pulls_before_zoom,
+        prune=prune,
+        prune_every=prune_every,
+        prune_sigma=prune_sigma
     )
 
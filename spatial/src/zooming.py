@@ -38,7 +38,8 @@ class Zooming(Algorithm):
     The implementation of the Zooming algorithm
     """
 
-    def __init__(self, nu=1, rho=0.9, domain=None, partition=BinaryPartition, scoring_method="ucb", reward_type=None, min_pulls_before_zoom=5): # edited by Marvin Ernst (2025)
+    def __init__(self, nu=1, rho=0.9, domain=None, partition=BinaryPartition, scoring_method="ucb", reward_type=None, min_pulls_before_zoom=5,
+                 prune=False, prune_every=50, prune_sigma=None): # edited by Marvin Ernst (2025)
         """
         Initialization of the Zooming algorithm
 
@@ -60,6 +61,18 @@ class Zooming(Algorithm):
             The type of reward distribution ("gaussian", "bernoulli")
         min_pulls_before_zoom: int
             Minimum number of pulls before zooming in on a node
+        prune: bool
+            Archive active arms whose upper confidence bound falls below the
+            best lower confidence bound, and restore them if it rises back
+        prune_every: int
+            Number of rounds between pruning passes
+        prune_sigma: float, optional
+            Noise scale of the pruning bounds, whose radius is
+            prune_sigma * sqrt(2 log(t + 1) / pulls). By default it is the
+            standard deviation of the observed rewards, pooled over the
+            active arms and re-estimated at every pass. (The unit scale of
+            the "ucb" score would not do: a UCB-driven active set keeps those
+            bounds overlapping, so nothing would ever be pruned.)
         """
 
         super(Zooming, self).__init__()
@@ -98,6 +111,17 @@ class Zooming(Algorithm):
         self.squared_rewards = {}  # initialize the dictionary here
         # ----------------------------
 
+        # Pruned arms live in compact parallel arrays instead of the dicts
+        # above, so `pull` never scores them and they cost no dict entries
+        self.prune = prune
+        self.prune_every = prune_every
+        self.prune_sigma = prune_sigma
+        self.archived_points = np.empty((0, len(domain)))
+        self.archived_stats = np.empty((0, 4))  # pulls, mean or successes, failures, squared rewards
+        self.archived_nodes = []
+        self.n_pruned = 0
+        self.n_restored = 0
+
         self.partition.deepen()
         for child in self.partition.get_layer_node_list(depth=1):
             self.make_active(child)
@@ -299,6 +323,108 @@ class Zooming(Algorithm):
                         self.best_arm
                     ] = child  # else, update the active arm to refer to the child node
 
+        if self.prune and self.time % self.prune_every == 0:
+            self.prune_dominated()
+
+    def _radius(self, pulls, scale):
+        return scale * np.sqrt(2 * np.log(self.time + 1) / pulls)
+
+    def _reward_std(self, keys, pulls, means):
+        # pooled within-arm standard deviation of the observed rewards
+        if self.reward_type == "bernoulli":
+            variance = np.sum(pulls * means * (1 - means)) / np.sum(pulls)
+        else:
+            squared = np.array([self.squared_rewards[arm] for arm in keys])
+            variance = (np.sum(squared) - np.sum(pulls * means**2)) / np.sum(pulls)
+        return np.sqrt(max(variance, 0.0))
+
+    def _archived_means(self):
+        stats = self.archived_stats
+        if self.reward_type == "bernoulli":
+            total = stats[:, 1] + stats[:, 2]
+            return np.divide(stats[:, 1], total, out=np.zeros(len(stats)), where=total > 0)
+        return stats[:, 1]
+
+    def prune_dominated(self):
+        """
+        Archive active arms whose upper confidence bound is below the best
+        lower confidence bound among the active arms, and restore archived
+        arms whose upper confidence bound has risen back above it.
+        """
+        keys = [arm for arm in self.active_points if self.pulled_times[arm] > 0]
+        if len(keys) < 2:
+            return
+        pulls = np.array([self.pulled_times[arm] for arm in keys], dtype=float)
+        if self.reward_type == "bernoulli":
+            means = np.array([self.successes[arm] for arm in keys]) / pulls
+        else:
+            means = np.array([self.average_rewards[arm] for arm in keys])
+        scale = self.prune_sigma
+        if scale is None:
+            scale = self._reward_std(keys, pulls, means)
+        radius = self._radius(pulls, scale)
+        best_lcb = np.max(means - radius)
+
+        if len(self.archived_nodes):
+            back = self._archived_means() + self._radius(self.archived_stats[:, 0], scale) >= best_lcb
+            self._restore_rows(np.flatnonzero(back))
+
+        dominated = [arm for arm, ucb in zip(keys, means + radius) if ucb < best_lcb]
+        if not dominated:
+            return
+        rows, stats = [], []
+        for arm in dominated:
+            if self.reward_type == "bernoulli":
+                first, second = self.successes.pop(arm), self.failures.pop(arm)
+            else:
+                first, second = self.average_rewards.pop(arm), 0.0
+            stats.append((self.pulled_times.pop(arm), first, second, self.squared_rewards.pop(arm, 0.0)))
+            rows.append(arm.p)
+            self.archived_nodes.append(self.active_points.pop(arm))
+        self.archived_points = np.vstack([self.archived_points, np.array(rows, dtype=float)])
+        self.archived_stats = np.vstack([self.archived_stats, np.array(stats, dtype=float)])
+        self.n_pruned += len(dominated)
+
+    def _restore_rows(self, rows):
+        if not len(rows):
+            return
+        for row in rows:
+            arm = point(self.archived_points[row])
+            pulled, first, second, squared = self.archived_stats[row]
+            self.active_points[arm] = self.archived_nodes[row]
+            self.pulled_times[arm] = int(pulled)
+            self.squared_rewards[arm] = squared
+            if self.reward_type == "bernoulli":
+                self.successes[arm] = int(first)
+                self.failures[arm] = int(second)
+            else:
+                self.average_rewards[arm] = first
+        keep = np.setdiff1d(np.arange(len(self.archived_nodes)), rows)
+        self.archived_points = self.archived_points[keep]
+        self.archived_stats = self.archived_stats[keep]
+        self.archived_nodes = [self.archived_nodes[row] for row in keep]
+        self.n_restored += len(rows)
+
+    def restore(self, arm):
+        """
+        Move an archived arm back to the active set with its statistics.
+
+        Parameters
+        ----------
+        arm : point
+            The archived arm
+
+        Returns
+        -------
+        bool
+            Whether `arm` was archived
+        """
+        if not len(self.archived_nodes):
+            return False
+        rows = np.flatnonzero(np.all(self.archived_points == np.asarray(arm.p, dtype=float), axis=1))
+        self._restore_rows(rows[:1])
+        return len(rows) > 0
+
     def get_last_point(self):
         """
         The function to get the last point of Zooming
@@ -320,7 +446,8 @@ Added by Marvin Ernst (2025)
 # selected by the Zooming algorithm. - for discrete arms:
 
 class DiscreteZoomingWrapper:
-    def __init__(self, f, arms, nu, rho, domain, scoring_method="ucb", reward_type=None, min_pulls_before_zoom=5):
+    def __init__(self, f, arms, nu, rho, domain, scoring_method="ucb", reward_type=None, min_pulls_before_zoom=5,
+                 prune=False, prune_every=50, prune_sigma=None):
         self.f = f
         self.arms = arms
         self.nu = nu
@@ -329,18 +456,25 @@ class DiscreteZoomingWrapper:
         self.scoring_method = scoring_method
         self.reward_type = reward_type
         self.min_pulls_before_zoom = min_pulls_before_zoom
+        self.prune = prune
+        self.prune_every = prune_every
+        self.prune_sigma = prune_sigma
         self.zoom = Zooming(
             nu=self.nu,
             rho=self.rho,
             domain=self.domain,
             scoring_method=self.scoring_method,
             reward_type=self.reward_type,
-            min_pulls_before_zoom=self.min_pulls_before_zoom
+            min_pulls_before_zoom=self.min_pulls_before_zoom,
+            prune=self.prune,
+            prune_every=self.prune_every,
+            prune_sigma=self.prune_sigma
         )
         self.zoom.f = self.f
         self.zoom.arms = self.arms
         self.zoom.tree = KDTree(self.arms)
         self.tree = KDTree(self.arms)
+        self.points_by_index = {}
 
     def select_arm(self, t):
         """
@@ -359,13 +493,23 @@ class DiscreteZoomingWrapper:
         x = self.zoom.pull(t)
         _, idx = self.tree.query(x)
         self.last_selected_point = x
+        self.last_selected_index = idx
+        # remember which active point proposed each arm, so a late reward
+        # (e.g. from a batch of selections) is credited to the right point
+        self.points_by_index[idx] = self.zoom.best_arm
         return self.arms[idx]
 
     def get_selected_index(self):
-        _, idx = self.tree.query(self.last_selected_point)
-        return idx
+        return self.last_selected_index
 
     def update(self, arm_idx, reward):
+        proposer = self.points_by_index.get(arm_idx, self.zoom.best_arm)
+        # the proposer (or, failing that, the current best arm) may have been
+        # pruned since it was selected; credit it after restoring it
+        if proposer is not None and proposer not in self.zoom.active_points:
+            self.zoom.restore(proposer)
+        if proposer in self.zoom.active_points:
+            self.zoom.best_arm = proposer
         self.zoom.receive_reward(self.zoom.time, reward)
 
     def receive_reward(self, t, reward):